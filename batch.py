@@ -0,0 +1,132 @@
+import concurrent.futures
+
+import matplotlib
+
+from config import BATCH_WORKERS, TEAM_FIELD
+from graph_builder import build_blocker_graph, chained_issue_keys
+from jira_client import GRAPH_FIELDS, JiraClient
+from visualizer import visualize_graph
+
+
+# Reads the team GUID from an issue's Team field (an object on Jira Cloud, a plain id elsewhere)
+def _issue_team_guid(issue: dict):
+    team = issue["fields"].get(TEAM_FIELD)
+    if isinstance(team, dict):
+        return team.get("id")
+    return team
+
+
+def partition_issues_by_team(issues: list, teams: dict) -> dict:
+    """
+    Split issues fetched for several teams into one list per team.
+
+    Args:
+        issues: List of Jira issues including the Team field
+        teams: Dictionary of team name to team GUID
+
+    Returns:
+        Dictionary of team name to that team's issues
+    """
+    names_by_guid = {guid: name for name, guid in teams.items()}
+    partitions: dict = {name: [] for name in teams}
+    for issue in issues:
+        team_name = names_by_guid.get(_issue_team_guid(issue))
+        if team_name:
+            partitions[team_name].append(issue)
+    return partitions
+
+
+def _init_worker():
+    # Workers only save files, so they don't need an interactive backend
+    matplotlib.use("Agg")
+
+
+def _render_team_graph(
+    team_name: str, issues: list, sprint_codes: str, layout_settings: dict, parent_names: dict
+):
+    """Build and save one team's graph (runs in a worker process)"""
+    graph, _, node_sizes = build_blocker_graph(issues)
+    return visualize_graph(
+        graph,
+        issues,
+        node_sizes,
+        None,
+        sprint_codes,
+        save_file=True,
+        layout_settings=layout_settings,
+        parent_names=parent_names,
+        team_name=team_name,
+    )
+
+
+def run_batch_mode(
+    jira_client: JiraClient,
+    project_key: str,
+    sprint_codes: str,
+    teams: dict,
+    layout_settings: dict,
+    max_workers=BATCH_WORKERS,
+) -> dict:
+    """
+    Generate one saved graph per team from a single shared fetch.
+
+    The issues of every team are fetched with one query, then split by team in memory. Parent
+    summaries are fetched once for all teams, and the team graphs are rendered in parallel
+    worker processes.
+
+    Args:
+        jira_client: JiraClient instance
+        project_key: The Jira project key
+        sprint_codes: Comma-separated list of sprint codes
+        teams: Dictionary of team name to team GUID
+        layout_settings: Dictionary with layout settings for the visualizer
+        max_workers: Maximum number of worker processes
+
+    Returns:
+        Dictionary of team name to saved file path (None for teams without blocker chains)
+    """
+    issues = jira_client.fetch_issues(
+        project_key,
+        sprint_codes,
+        ",".join(teams.values()),
+        fields=f"{GRAPH_FIELDS},{TEAM_FIELD}",
+    )
+    partitions = partition_issues_by_team(issues, teams)
+
+    # Parents of chained tickets only, shared by every team. The graphs themselves are built
+    # in the workers, so only the links are read here
+    parent_keys = set()
+    for team_issues in partitions.values():
+        issues_in_chains = chained_issue_keys(team_issues)
+        for issue in team_issues:
+            parent = issue["fields"].get("parent")
+            if parent and issue["key"] in issues_in_chains:
+                parent_keys.add(parent["key"])
+    parent_names = jira_client.fetch_parent_issue_summaries(parent_keys)
+
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker
+    ) as executor:
+        futures = {
+            executor.submit(
+                _render_team_graph,
+                team_name,
+                team_issues,
+                sprint_codes,
+                layout_settings,
+                parent_names,
+            ): team_name
+            for team_name, team_issues in partitions.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            team_name = futures[future]
+            try:
+                results[team_name] = future.result()
+            except Exception as e:
+                print(f"An error occurred rendering the graph for {team_name}: {e}")
+                results[team_name] = None
+
+    for team_name in teams:
+        print(f"{team_name}: {results.get(team_name) or 'no blocker chains found'}")
+    return results
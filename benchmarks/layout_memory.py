@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the peak memory and time of laying out a large generated blocker graph.
+
+Usage: python benchmarks/layout_memory.py LAYOUT [ISSUES] [EPICS]
+
+ISSUES defaults to 10000 and EPICS to 20, the graph the README's numbers were measured on.
+
+The issues are generated with a fixed seed: each epic's tickets block up to two tickets,
+mostly within the same epic. Peak memory is read from the process's maximum resident set
+size (Unix only), so run one layout per process. The numbers are printed as JSON.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import resource
+import sys
+import time
+
+import matplotlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import LAYOUT_ALGORITHMS  # noqa: E402
+from graph_builder import build_blocker_graph  # noqa: E402
+from visualizer import layout_graph  # noqa: E402
+
+
+def generate_issues(count: int, epics: int, seed=7) -> list:
+    """
+    Generate Jira issues linked into blocker chains.
+
+    Args:
+        count: Number of issues
+        epics: Number of parent epics the issues are split between
+        seed: Seed for the random links
+
+    Returns:
+        List of Jira issues with the fields the layout uses
+    """
+    rng = random.Random(seed)
+    per_epic = max(1, count // epics)
+    issues = []
+    for n in range(count):
+        epic = n // per_epic
+        links = []
+        for _ in range(2):
+            if rng.random() < 0.6:
+                if rng.random() < 0.9:
+                    target = rng.randint(
+                        epic * per_epic, min(epic * per_epic + per_epic, count) - 1
+                    )
+                else:
+                    target = rng.randint(0, count - 1)
+                links.append({"type": {"name": "Blocks"}, "outwardIssue": {"key": f"ENG-{target}"}})
+        issues.append(
+            {
+                "key": f"ENG-{n}",
+                "fields": {
+                    "issuelinks": links,
+                    "parent": {"key": f"EP-{epic}"},
+                    "status": {"name": "To Do"},
+                    "summary": f"Generated issue {n}",
+                },
+            }
+        )
+    return issues
+
+
+# Peak resident set size of this process in MB (ru_maxrss is in KB on Linux, bytes on macOS)
+def _peak_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    """Lay out one generated graph and print its size, memory and time."""
+    if len(sys.argv) < 2 or sys.argv[1] not in LAYOUT_ALGORITHMS:
+        print(__doc__)
+        print(f"LAYOUT is one of: {', '.join(LAYOUT_ALGORITHMS)}")
+        sys.exit(1)
+    layout = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    epics = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    matplotlib.use("Agg")
+    issues = generate_issues(count, epics)
+    gc.collect()
+    base = _peak_mb()
+
+    started_at = time.perf_counter()
+    graph, _, _ = build_blocker_graph(issues)
+    with contextlib.redirect_stdout(io.StringIO()):
+        layout_graph(graph, issues, {"cluster_layout": "circular", "node_layout": layout}, {})
+    elapsed = time.perf_counter() - started_at
+
+    peak = _peak_mb()
+    print(
+        json.dumps(
+            {
+                "layout": layout,
+                "nodes": graph.number_of_nodes(),
+                "edges": graph.number_of_edges(),
+                "base_mb": round(base, 1),
+                "peak_mb": round(peak, 1),
+                "delta_mb": round(peak - base, 1),
+                "seconds": round(elapsed, 2),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
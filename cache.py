@@ -0,0 +1,135 @@
+import collections
+import threading
+import time
+import typing
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire after a fixed time.
+
+    When the cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Hashable, default=None) -> typing.Any:
+        """Return the cached value for key, or default if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: typing.Hashable, value: typing.Any):
+        """Store value under key, evicting the least recently used entries if needed"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: typing.Any = None
+        self.error: typing.Optional[BaseException] = None
+        self.listeners: typing.List[typing.Callable] = []
+        self.progress: typing.Optional[tuple] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single call.
+
+    The first caller for a key runs the function. Callers that arrive while it is running wait
+    for it and receive the same result, or the same exception. Progress the function reports
+    through notify reaches the listener of every caller, not only the first one.
+    """
+
+    def __init__(self):
+        self._flights: typing.Dict[typing.Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: typing.Hashable,
+        fn: typing.Callable[[], typing.Any],
+        listener: typing.Optional[typing.Callable] = None,
+    ) -> typing.Any:
+        """
+        Run fn for key, or wait for the call already in flight for key.
+
+        Args:
+            key: Identifies the call, callers with equal keys share it
+            fn: Function making the call
+            listener: Optional callable receiving the progress passed to notify for key. A
+                caller joining a call in flight first receives its latest progress
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            if listener is not None:
+                flight.listeners.append(listener)
+            progress = flight.progress
+
+        assert flight is not None
+        if listener is not None and progress is not None:
+            _call_listener(listener, progress)
+        if is_leader:
+            try:
+                flight.result = fn()
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def notify(self, key: typing.Hashable, *progress: typing.Any):
+        """
+        Pass progress of the call in flight for key to the listeners of every caller sharing it.
+
+        Listeners run in the calling thread. Their errors are printed and don't stop the call,
+        which other callers are waiting on.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                return
+            flight.progress = progress
+            listeners = list(flight.listeners)
+        for listener in listeners:
+            _call_listener(listener, progress)
+
+
+# Calls a progress listener, printing its errors instead of raising them
+def _call_listener(listener: typing.Callable, progress: tuple):
+    try:
+        listener(*progress)
+    except Exception as e:
+        print(f"An error occurred reporting progress: {e}")
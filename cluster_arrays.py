@@ -0,0 +1,250 @@
+import typing
+
+import networkx as nx
+import numpy as np
+from scipy.optimize import minimize
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import shortest_path
+from scipy.spatial.distance import cdist
+
+# Upper bound on the node pairs held in memory at once by the force-directed layout
+_PAIR_CHUNK = 1 << 18
+
+
+class ClusterArrays:
+    """
+    Clusters of a blocker graph as integer-indexed arrays.
+
+    Nodes are numbered cluster by cluster, so cluster i owns node indices offsets[i] up to
+    offsets[i + 1]. The blocker links inside a cluster are kept as CSR adjacency (indptr,
+    indices) over those indices, in both directions since most layouts treat links as
+    undirected. blocks marks the entries where the row's ticket blocks the column's ticket,
+    for Kamada-Kawai, which follows the links' direction like networkx on a DiGraph. Links
+    between clusters are left out, no layout uses them.
+    """
+
+    def __init__(self, graph: nx.DiGraph, clusters: dict):
+        self.cluster_ids = list(clusters)
+        self.nodes = [node for nodes in clusters.values() for node in nodes]
+        self.offsets = np.zeros(len(self.cluster_ids) + 1, dtype=np.int64)
+        np.cumsum([len(nodes) for nodes in clusters.values()], out=self.offsets[1:])
+
+        node_index = {node: i for i, node in enumerate(self.nodes)}
+        node_cluster = np.repeat(np.arange(len(self.cluster_ids)), np.diff(self.offsets))
+        edges = np.fromiter(
+            (node_index[node] for edge in graph.edges() for node in edge), dtype=np.int64
+        ).reshape(-1, 2)
+        edges = edges[
+            (node_cluster[edges[:, 0]] == node_cluster[edges[:, 1]]) & (edges[:, 0] != edges[:, 1])
+        ]
+        # Sorted by row then column, with links in both directions counted once
+        pairs = np.unique(np.concatenate([edges, edges[:, ::-1]]), axis=0)
+        self.indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs[:, 0], minlength=len(self.nodes)), out=self.indptr[1:])
+        self.indices = pairs[:, 1].copy()
+        count = len(self.nodes)
+        self.blocks = np.isin(pairs[:, 0] * count + pairs[:, 1], edges[:, 0] * count + edges[:, 1])
+
+    def cluster_nodes(self, cluster: int) -> list:
+        """Get the node keys of a cluster, in index order"""
+        return self.nodes[self.offsets[cluster] : self.offsets[cluster + 1]]
+
+    def cluster_adjacency(self, cluster: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Get a cluster's CSR adjacency (indptr, indices), renumbered from 0"""
+        start, end = self.offsets[cluster], self.offsets[cluster + 1]
+        indptr = self.indptr[start : end + 1]
+        return indptr - indptr[0], self.indices[indptr[0] : indptr[-1]] - start
+
+    def cluster_blocks(self, cluster: int) -> np.ndarray:
+        """Get which entries of a cluster's CSR adjacency are blocker links in that direction"""
+        start, end = self.indptr[self.offsets[cluster]], self.indptr[self.offsets[cluster + 1]]
+        return self.blocks[start:end]
+
+
+def rescale_positions(pos: np.ndarray) -> np.ndarray:
+    """Center positions on the origin and scale them so the largest coordinate is 1"""
+    pos = pos - pos.mean(axis=0)
+    limit = np.abs(pos).max()
+    return pos / limit if limit > 0 else pos
+
+
+def circular_positions(count: int) -> np.ndarray:
+    """Place nodes evenly on the unit circle, in index order (like nx.circular_layout)"""
+    if count == 1:
+        return np.zeros((1, 2))
+    theta = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    return rescale_positions(np.column_stack([np.cos(theta), np.sin(theta)]))
+
+
+def force_directed_positions(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    k: float,
+    iterations: int,
+    threshold: float,
+    initial: typing.Optional[np.ndarray] = None,
+    seed: typing.Optional[int] = None,
+    blocks: typing.Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Lay out a cluster with the Fruchterman-Reingold force model (like nx.spring_layout).
+
+    Repulsion between every pair of nodes is computed a block of rows at a time, and
+    attraction only along the CSR links, so memory stays linear in the cluster size. Given
+    the direction of the links, a ticket is only pulled toward the tickets it blocks, as in
+    networkx's layout of a DiGraph.
+
+    Args:
+        indptr: CSR row pointers of the cluster's links
+        indices: CSR column indices of the cluster's links
+        k: Optimal distance between nodes
+        iterations: Maximum number of iterations
+        threshold: Stop once nodes move less than this on average per iteration
+        initial: Optional starting positions. Rows left as NaN (nodes without a known
+            position) start at random points within the known layout, like networkx does
+        seed: Optional seed for the random starting positions, so the layout can be repeated
+        blocks: Optional mask of the CSR entries that are blocker links in that direction
+            (see ClusterArrays.cluster_blocks). Links pull both ways without it
+
+    Returns:
+        Array of positions, one row per node, scaled to [-1, 1]
+    """
+    count = len(indptr) - 1
+    if count == 1:
+        return np.zeros((1, 2))
+    pos = np.random.default_rng(seed).random((count, 2))
+    if initial is not None:
+        known = ~np.isnan(initial).any(axis=1)
+        pos *= np.abs(initial[known]).max(initial=0) or 1
+        pos[known] = initial[known]
+    rows = np.repeat(np.arange(count), np.diff(indptr))
+    if blocks is not None:
+        rows, indices = rows[blocks], indices[blocks]
+    chunk = max(1, _PAIR_CHUNK // count)
+
+    # The temperature caps how far a node moves, and cools linearly to 0
+    temperature = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1])) * 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = np.empty_like(pos)
+        for start in range(0, count, chunk):
+            delta = pos[start : start + chunk, np.newaxis, :] - pos[np.newaxis, :, :]
+            # Squared distances, at least 0.01 apart like networkx
+            squared = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), 1e-4)
+            displacement[start : start + chunk] = np.einsum("ijk,ij->ik", delta, k * k / squared)
+        delta = pos[rows] - pos[indices]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+        np.subtract.at(displacement, rows, delta * (distance / k)[:, np.newaxis])
+
+        length = np.linalg.norm(displacement, axis=-1)
+        # Nodes with almost no net force are moved as if it were 0.1, like networkx
+        length = np.where(length < 0.01, 0.1, length)
+        step = displacement * (temperature / length)[:, np.newaxis]
+        pos += step
+        temperature -= cooling
+        if np.linalg.norm(step) / count < threshold:
+            break
+    return rescale_positions(pos)
+
+
+# Kamada-Kawai energy and gradient for flattened positions. Both terms of a pair of nodes
+# are summed into symmetric weights (directed link distances differ by direction), so the
+# gradient is a matrix product instead of an (n, n, 2) array of offsets, and the (n, n)
+# arrays are updated in place
+def _kamada_kawai_cost(
+    flat_pos: np.ndarray, inverse_distance: np.ndarray, mean_weight: float
+) -> typing.Tuple[float, np.ndarray]:
+    pos = flat_pos.reshape(-1, 2)
+    separation = cdist(pos, pos)
+    offset = separation * inverse_distance
+    offset -= 1.0
+    np.fill_diagonal(offset, 0)
+    cost = 0.5 * np.vdot(offset, offset)
+
+    np.fill_diagonal(separation, 1e-3)
+    weights = offset
+    weights *= inverse_distance
+    weights /= separation
+    weights += weights.T
+    gradient = weights.sum(axis=1)[:, np.newaxis] * pos - weights @ pos
+
+    # Keeps the layout centered on the origin
+    mean_pos = pos.sum(axis=0)
+    cost += 0.5 * mean_weight * np.sum(mean_pos**2)
+    gradient += mean_weight * mean_pos
+    return cost, gradient.ravel()
+
+
+def kamada_kawai_positions(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    initial: typing.Optional[np.ndarray] = None,
+    blocks: typing.Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Lay out a cluster with the Kamada-Kawai model (like nx.kamada_kawai_layout).
+
+    Link distances come from scipy's sparse shortest paths as one dense array, rather than
+    a dictionary entry per pair of nodes. Given the direction of the links, distances follow
+    blocker links only, like networkx's layout of a DiGraph: a ticket is far from the tickets
+    that block it unless it also reaches them.
+
+    Args:
+        indptr: CSR row pointers of the cluster's links
+        indices: CSR column indices of the cluster's links
+        initial: Optional starting positions, a circle otherwise
+        blocks: Optional mask of the CSR entries that are blocker links in that direction
+            (see ClusterArrays.cluster_blocks). Links are undirected without it
+
+    Returns:
+        Array of positions, one row per node, scaled to [-1, 1]
+    """
+    count = len(indptr) - 1
+    if count == 1:
+        return np.zeros((1, 2))
+    weights = np.ones(len(indices)) if blocks is None else blocks.astype(float)
+    adjacency = csr_matrix((weights, indices, indptr), shape=(count, count))
+    adjacency.eliminate_zeros()
+    distance = shortest_path(adjacency, directed=blocks is not None, unweighted=True)
+    # Tickets in separate chains of the same cluster sit far apart, as in networkx
+    distance[np.isinf(distance)] = 1e6
+    distance += np.eye(count) * 1e-3
+    inverse_distance = np.reciprocal(distance, out=distance)
+
+    start = circular_positions(count) if initial is None else initial
+    result = minimize(
+        _kamada_kawai_cost,
+        start.ravel(),
+        method="L-BFGS-B",
+        args=(inverse_distance, 1e-3),
+        jac=True,
+    )
+    return rescale_positions(result.x.reshape(-1, 2))
+
+
+def planar_positions(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Lay out a cluster without crossing links, raising NetworkXException if it is not planar"""
+    count = len(indptr) - 1
+    graph = nx.Graph()
+    graph.add_nodes_from(range(count))
+    graph.add_edges_from(
+        zip(np.repeat(np.arange(count), np.diff(indptr)).tolist(), indices.tolist())
+    )
+    pos = nx.planar_layout(graph)
+    return np.array([pos[i] for i in range(count)], dtype=float).reshape(-1, 2)
+
+
+def cluster_extents(pos: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Find how far each cluster's nodes reach from the cluster center.
+
+    Args:
+        pos: Node positions relative to their cluster center, grouped by cluster
+        offsets: Start index of each cluster, followed by the node count
+
+    Returns:
+        Array with the largest node distance of each cluster
+    """
+    if len(pos) == 0:
+        return np.zeros(len(offsets) - 1)
+    return np.maximum.reduceat(np.linalg.norm(pos, axis=1), offsets[:-1])
@@ -1,3 +1,5 @@
+import os
+
 DEFAULT_DOT_SIZE = 1500
 DOT_SCALING_AMOUNT = 1000
 
@@ -17,3 +19,100 @@ CLUSTER_LAYOUT = "circular"
 NODE_LAYOUT = "circular"
 CLUSTER_K_DIST = 1
 NODE_K_DIST = 1
+
+# Default output of CLI mode: "png" renders with matplotlib, "html" writes an
+# interactive page that lays the graph out in the browser
+OUTPUT_FORMAT = "png"
+
+# Cross-scope expansion: how many "Blocks" hops to follow outside the fetched
+# sprints (0 disables it) and the maximum number of extra tickets to pull in
+EXPAND_DEPTH = 0
+EXPAND_MAX_ISSUES = 200
+
+# Seconds between polls when running with --watch
+WATCH_INTERVAL = 300
+
+# Layout algorithms accepted by create_plot_points
+LAYOUT_ALGORITHMS = ["kamada-kawai", "spring", "fruchterman_reingold", "circular", "planar"]
+
+# HTTP service mode (--serve): where to listen, and how long / how many fetched
+# scopes and rendered graphs are kept in memory
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+SERVER_CACHE_TTL = 300
+SERVER_CACHE_MAX_ENTRIES = 64
+
+# Jira request rate shared by every client and thread (steady rate and burst
+# size), and how many times a throttled (HTTP 429) request is retried
+JIRA_REQUESTS_PER_SECOND = 10
+JIRA_REQUEST_BURST = 20
+JIRA_MAX_RETRIES = 3
+
+# Where --snapshot stores the compressed graph snapshots
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output", "snapshots")
+
+# Teams available in the GUI dropdown and to --batch-teams (name: Team field GUID)
+TEAM_OPTIONS = {
+    "Armadillo": "cea040b4-0710-4359-b46d-f9b64c27ef36",
+    "Backpack": "a4bb26c1-324e-4218-9120-feda39ca1279",
+    "AI": "34fdd1e2-222f-4962-9413-522537118a1a",
+    "Data": "9acb7f88-e87e-4c61-8e8a-65cdf8e00e88",
+}
+
+# Id of the Team custom field in issue responses (customfield_10001 on Jira Cloud)
+TEAM_FIELD = "customfield_10001"
+
+# Number of worker processes rendering team graphs in --batch-teams mode
+BATCH_WORKERS = 4
+
+# Number of parallel queries used to fetch a scope (split by project, sprint and
+# page ranges). 1 fetches the whole scope with a single paginated query
+FETCH_WORKERS = 4
+
+# Disk-backed graph store (--store): default database path
+GRAPH_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output", "graph.db")
+
+# Layout defaults: iterations, convergence threshold and random seed of the
+# force-directed layouts (None for new starting positions every run), and the
+# resolution of saved images
+LAYOUT_ITERATIONS = 150
+LAYOUT_THRESHOLD = 1e-4
+LAYOUT_SEED = None
+RENDER_DPI = 100
+
+###########################
+# Performance profiles (--profile-mode and the GUI dropdown):
+# - fast: fewer layout iterations, more parallel fetches of smaller pages, low resolution
+#   images
+# - balanced: the defaults above
+# - quality: more layout iterations, every run laid out from scratch, high resolution
+# page_size is the number of issues per Jira request (100 is the most Jira allows),
+# use_cache reuses layout positions between runs of the same session
+###########################
+PERFORMANCE_PROFILES = {
+    "fast": {
+        "layout_iterations": 50,
+        "layout_threshold": 1e-3,
+        "fetch_workers": 8,
+        "page_size": 50,
+        "use_cache": True,
+        "dpi": 72,
+    },
+    "balanced": {
+        "layout_iterations": LAYOUT_ITERATIONS,
+        "layout_threshold": LAYOUT_THRESHOLD,
+        "fetch_workers": FETCH_WORKERS,
+        "page_size": 100,
+        "use_cache": True,
+        "dpi": RENDER_DPI,
+    },
+    "quality": {
+        "layout_iterations": 500,
+        "layout_threshold": 1e-5,
+        "fetch_workers": FETCH_WORKERS,
+        "page_size": 100,
+        "use_cache": False,
+        "dpi": 200,
+    },
+}
+PROFILE_MODE = "balanced"
@@ -1,26 +1,189 @@
+import hashlib
 import typing
 
 import networkx as nx
 
-from config import DEFAULT_DOT_SIZE, DOT_SCALING_AMOUNT
+from config import DEFAULT_DOT_SIZE, DOT_SCALING_AMOUNT, EXPAND_MAX_ISSUES
 
 
 def build_blocker_graph(issues: list) -> typing.Tuple[nx.DiGraph, set, dict]:
+    """
+    Build the graph of "Blocks" links between the given issues.
+
+    Tickets only enter the graph through a link, so the graph holds exactly the tickets in
+    blocker chains and can be laid out and drawn as it is, without a subgraph view.
+
+    Args:
+        issues: List of Jira issues
+
+    Returns:
+        Tuple of (graph, keys of the chained tickets, node size of every issue)
+    """
     graph = nx.DiGraph()
     issues_in_chains = set()
-    node_sizes = {}
+    node_sizes = {issue["key"]: DEFAULT_DOT_SIZE for issue in issues}
 
-    for issue in issues:
-        key = issue["key"]
-        node_sizes[key] = DEFAULT_DOT_SIZE
-        if "issuelinks" in issue["fields"]:
-            for link in issue["fields"]["issuelinks"]:
-                if "outwardIssue" in link and link["type"]["name"] == "Blocks":
-                    blocked_issue_key = link["outwardIssue"]["key"]
-                    if blocked_issue_key in [i["key"] for i in issues]:
-                        graph.add_edge(key, blocked_issue_key)
-                        issues_in_chains.add(key)
-                        issues_in_chains.add(blocked_issue_key)
-                        node_sizes[key] += DOT_SCALING_AMOUNT
+    for key, blocked_issue_key in _blocker_links(issues):
+        graph.add_edge(key, blocked_issue_key)
+        issues_in_chains.add(key)
+        issues_in_chains.add(blocked_issue_key)
+        node_sizes[key] += DOT_SCALING_AMOUNT
 
     return graph, issues_in_chains, node_sizes
+
+
+# Yields (blocker, blocked) key pairs for the "Blocks" links between the given issues
+def _blocker_links(issues: list) -> typing.Iterator[typing.Tuple[str, str]]:
+    issue_keys = {issue["key"] for issue in issues}
+    for issue in issues:
+        for link in issue["fields"].get("issuelinks") or []:
+            if "outwardIssue" in link and link["type"]["name"] == "Blocks":
+                blocked_issue_key = link["outwardIssue"]["key"]
+                if blocked_issue_key in issue_keys:
+                    yield issue["key"], blocked_issue_key
+
+
+def chained_issue_keys(issues: list) -> set:
+    """
+    Find the tickets in blocker chains without building the graph.
+
+    Args:
+        issues: List of Jira issues
+
+    Returns:
+        Set of the keys of tickets that block, or are blocked by, another of the issues
+    """
+    return {key for link in _blocker_links(issues) for key in link}
+
+
+def longest_blocker_chain(edges: typing.Iterable[typing.Tuple[str, str]]) -> typing.List[list]:
+    """
+    Find the longest chain of blockers.
+
+    Tickets that block each other in a cycle have no order, so each blocker cycle is condensed
+    into a single step that counts all of its tickets.
+
+    Args:
+        edges: (blocker, blocked) pairs of ticket keys
+
+    Returns:
+        Steps from the first blocker to the last blocked ticket. Each step is a list with one
+        ticket key, or the sorted keys of the tickets in a blocker cycle
+    """
+    links = nx.DiGraph()
+    links.add_edges_from(edges)
+    if links.number_of_edges() == 0:
+        return []
+
+    condensed = nx.condensation(links)
+    # Number of tickets on the longest chain ending at each step, and the step before it
+    length: dict = {}
+    previous: dict = {}
+    for step in nx.topological_sort(condensed):
+        before = max(condensed.predecessors(step), key=length.__getitem__, default=None)
+        previous[step] = before
+        size = len(condensed.nodes[step]["members"])
+        length[step] = size + (length[before] if before is not None else 0)
+
+    step = max(length, key=length.__getitem__)
+    path = []
+    while step is not None:
+        path.append(sorted(condensed.nodes[step]["members"]))
+        step = previous[step]
+    return path[::-1]
+
+
+def graph_fingerprint(graph: nx.DiGraph, issues: list) -> str:
+    """
+    Compute a structural fingerprint of a blocker graph.
+
+    The fingerprint covers the chained ticket keys, the blocker edges and each ticket's parent,
+    which is everything the layout and render depend on. Two runs with the same fingerprint
+    produce the same graph, so the second render can be skipped.
+
+    Args:
+        graph: NetworkX DiGraph of blocker relationships
+        issues: List of Jira issues the graph was built from
+
+    Returns:
+        Hex digest identifying the graph structure
+    """
+    parents = {
+        issue["key"]: (issue["fields"].get("parent") or {}).get("key", "")
+        for issue in issues
+        if issue["key"] in graph
+    }
+    digest = hashlib.sha1()
+    for node in sorted(graph.nodes()):
+        digest.update(f"n|{node}|{parents.get(node, '')}\n".encode())
+    for source, target in sorted(graph.edges()):
+        digest.update(f"e|{source}|{target}\n".encode())
+    return digest.hexdigest()
+
+
+# Collects the keys of open issues linked to this issue by a "Blocks" link in either direction
+def _linked_blocker_keys(issue: dict) -> set:
+    linked_keys = set()
+    for link in issue["fields"].get("issuelinks") or []:
+        if link["type"]["name"] != "Blocks":
+            continue
+        linked_issue = link.get("outwardIssue") or link.get("inwardIssue")
+        if not linked_issue:
+            continue
+        # Linked issues carry their status, so finished tickets are pruned without a fetch
+        status = linked_issue.get("fields", {}).get("status", {}).get("name", "")
+        if status.upper() != "DONE":
+            linked_keys.add(linked_issue["key"])
+    return linked_keys
+
+
+def expand_blocker_scope(
+    issues: list, jira_client, max_depth: int, max_issues=EXPAND_MAX_ISSUES, fields=None
+) -> list:
+    """
+    Expand a set of issues by following "Blocks" links to tickets outside the fetched scope.
+
+    The links are walked breadth-first in both directions. Each frontier is fetched with
+    batched `key in (...)` queries, so the cost is one request per level rather than one
+    request per ticket.
+
+    Args:
+        issues: List of Jira issues already fetched
+        jira_client: JiraClient instance used to fetch the out-of-scope tickets
+        max_depth: Number of link hops to follow outside the original scope
+        max_issues: Maximum number of extra tickets to pull in
+        fields: Optional comma-separated list of fields to fetch for the extra tickets
+            (default: all fields)
+
+    Returns:
+        The original issues followed by the out-of-scope issues that were reached
+    """
+    expanded = list(issues)
+    seen_keys = {issue["key"] for issue in issues}
+    frontier = issues
+    fetched_count = 0
+
+    for depth in range(1, max_depth + 1):
+        next_keys: set = set()
+        for issue in frontier:
+            next_keys |= _linked_blocker_keys(issue)
+        next_keys -= seen_keys
+        if not next_keys:
+            break
+
+        remaining = max_issues - fetched_count
+        if remaining <= 0:
+            print(f"Reached the expansion limit of {max_issues} issues")
+            break
+        if len(next_keys) > remaining:
+            print(f"Expansion limit reached, fetching {remaining} of {len(next_keys)} issues")
+            next_keys = set(sorted(next_keys)[:remaining])
+
+        print(f"Expanding blocker scope (depth {depth}): {len(next_keys)} linked issues")
+        # Keys that turn out to be DONE or inaccessible are still marked as seen
+        seen_keys |= next_keys
+        frontier = jira_client.fetch_issues_by_keys(next_keys, fields=fields)
+        fetched_count += len(frontier)
+        expanded.extend(frontier)
+
+    return expanded
@@ -0,0 +1,231 @@
+import heapq
+import os
+import sqlite3
+import typing
+
+import networkx as nx
+
+from config import DEFAULT_DOT_SIZE, DOT_SCALING_AMOUNT
+from graph_builder import longest_blocker_chain
+
+# Fields needed to store an issue, its parent and its blocker links
+STORE_FIELDS = "issuelinks,parent,status,summary"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    parent TEXT,
+    status TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_parent ON issues (parent);
+CREATE TABLE IF NOT EXISTS edges (
+    blocker TEXT NOT NULL,
+    blocked TEXT NOT NULL,
+    PRIMARY KEY (blocker, blocked)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_blocked ON edges (blocked, blocker);
+CREATE TABLE IF NOT EXISTS parents (
+    key TEXT PRIMARY KEY,
+    summary TEXT
+);
+"""
+
+
+class GraphStore:
+    """
+    Blocker graph kept in a SQLite database instead of in memory.
+
+    Issues are streamed into the store one page at a time. Chain, impact and top blocker
+    questions are answered with recursive SQL, and only the slice of the graph that is asked
+    for is loaded into memory for rendering. The critical path is the exception: it needs
+    every blocker link in memory (see critical_path).
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def load_project(self, jira_client, project_key: str) -> int:
+        """
+        Replace the stored graph with every open issue of a project.
+
+        Args:
+            jira_client: JiraClient instance
+            project_key: The Jira project key
+
+        Returns:
+            Number of issues stored
+        """
+        jql = f"project = {project_key} AND status != DONE ORDER BY key ASC"
+        print(f"Executing JQL query: {jql}")
+
+        count = 0
+        with self.connection:
+            self.connection.execute("DELETE FROM issues")
+            self.connection.execute("DELETE FROM edges")
+            for page_issues, total in jira_client.iter_issue_pages(jql, fields=STORE_FIELDS):
+                self._insert_page(page_issues)
+                count += len(page_issues)
+                print(f"Stored {count} of {total} issues")
+
+            # Like build_blocker_graph, only keep links between issues that were fetched
+            self.connection.execute(
+                "DELETE FROM edges WHERE blocked NOT IN (SELECT key FROM issues)"
+            )
+        return count
+
+    def _insert_page(self, issues: list):
+        issue_rows = []
+        edge_rows = []
+        for issue in issues:
+            fields = issue["fields"]
+            issue_rows.append(
+                (
+                    issue["key"],
+                    (fields.get("parent") or {}).get("key"),
+                    (fields.get("status") or {}).get("name"),
+                    fields.get("summary"),
+                )
+            )
+            for link in fields.get("issuelinks") or []:
+                if "outwardIssue" in link and link["type"]["name"] == "Blocks":
+                    edge_rows.append((issue["key"], link["outwardIssue"]["key"]))
+        self.connection.executemany("INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?)", issue_rows)
+        self.connection.executemany("INSERT OR IGNORE INTO edges VALUES (?, ?)", edge_rows)
+
+    def chain(self, key: str, direction="both") -> set:
+        """
+        Find the tickets connected to a ticket through blockers.
+
+        Args:
+            key: The ticket to start from
+            direction: "downstream" (tickets it blocks), "upstream" (tickets blocking it) or
+                "both"
+
+        Returns:
+            Set of ticket keys, including the starting ticket
+        """
+        keys = {key}
+        if direction in ("downstream", "both"):
+            keys |= self._reachable(key, "blocker", "blocked")
+        if direction in ("upstream", "both"):
+            keys |= self._reachable(key, "blocked", "blocker")
+        return keys
+
+    def _reachable(self, key: str, from_column: str, to_column: str) -> set:
+        # UNION (not UNION ALL) drops rows already seen, so blocker cycles terminate
+        rows = self.connection.execute(
+            f"""
+            WITH RECURSIVE reachable(key) AS (
+                SELECT ?
+                UNION
+                SELECT edges.{to_column} FROM edges
+                JOIN reachable ON edges.{from_column} = reachable.key
+            )
+            SELECT key FROM reachable
+            """,
+            (key,),
+        )
+        return {row[0] for row in rows} - {key}
+
+    def impact(self, key: str) -> int:
+        """Count the tickets a ticket blocks, directly or through other tickets"""
+        return len(self._reachable(key, "blocker", "blocked"))
+
+    def top_blockers(self, limit: int) -> typing.List[typing.Tuple[str, int]]:
+        """
+        List the tickets that block the most other tickets, with their impact.
+
+        Impact is counted one blocker at a time, so only one ticket's reachable set is held
+        at once instead of the whole transitive closure.
+        """
+        blockers = self.connection.execute("SELECT DISTINCT blocker FROM edges").fetchall()
+        impacts = ((key, self.impact(key)) for (key,) in blockers)
+        # Highest impact first, ties broken by key
+        return heapq.nsmallest(limit, impacts, key=lambda item: (-item[1], item[0]))
+
+    def critical_path(self) -> typing.List[typing.List[str]]:
+        """
+        Find the longest chain of blockers (see graph_builder.longest_blocker_chain).
+
+        Unlike the other queries this is not answered in SQL: every blocker link of the
+        project is loaded into memory (the issues are not), so memory grows with the number
+        of links.
+
+        Returns:
+            Steps from the first blocker to the last blocked ticket. Each step is a list with
+            one ticket key, or the sorted keys of the tickets in a blocker cycle
+        """
+        return longest_blocker_chain(self.connection.execute("SELECT blocker, blocked FROM edges"))
+
+    def subgraph(self, keys: typing.Iterable[str]) -> typing.Tuple[nx.DiGraph, list, dict]:
+        """
+        Load a slice of the stored graph for rendering.
+
+        Returns:
+            Tuple of (graph, issues, node sizes) in the same shape as build_blocker_graph's
+            results, ready for visualize_graph
+        """
+        self.connection.execute("DROP TABLE IF EXISTS temp.slice")
+        self.connection.execute("CREATE TEMP TABLE slice (key TEXT PRIMARY KEY)")
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO temp.slice VALUES (?)", ((key,) for key in keys)
+        )
+
+        graph = nx.DiGraph()
+        node_sizes = {}
+        edges = self.connection.execute("""
+            SELECT blocker, blocked FROM edges
+            WHERE blocker IN (SELECT key FROM temp.slice)
+            AND blocked IN (SELECT key FROM temp.slice)
+            """)
+        for blocker, blocked in edges:
+            graph.add_edge(blocker, blocked)
+            node_sizes.setdefault(blocker, DEFAULT_DOT_SIZE)
+            node_sizes[blocker] += DOT_SCALING_AMOUNT
+
+        issues = []
+        for key, parent, summary in self.connection.execute(
+            "SELECT key, parent, summary FROM issues WHERE key IN (SELECT key FROM temp.slice)"
+        ):
+            fields: dict = {"summary": summary}
+            if parent:
+                fields["parent"] = {"key": parent}
+            issues.append({"key": key, "fields": fields})
+            node_sizes.setdefault(key, DEFAULT_DOT_SIZE)
+        return graph, issues, node_sizes
+
+    def parent_names(self, jira_client, parent_keys: typing.Iterable[str]) -> dict:
+        """Get parent summaries, fetching and storing the ones not stored yet"""
+        keys = sorted(set(parent_keys))
+        names: dict = {}
+        # Chunked to stay under SQLite's limit on query parameters
+        for i in range(0, len(keys), 500):
+            batch = keys[i : i + 500]
+            placeholders = ", ".join("?" * len(batch))
+            names.update(
+                self.connection.execute(
+                    f"SELECT key, summary FROM parents WHERE key IN ({placeholders})", batch
+                )
+            )
+        missing = set(keys) - set(names)
+        if missing:
+            fetched = jira_client.fetch_parent_issue_summaries(missing)
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO parents VALUES (?, ?)",
+                    [
+                        (key, summary)
+                        for key, summary in fetched.items()
+                        if not summary.startswith("Error:")
+                    ],
+                )
+            names.update(fetched)
+        return names
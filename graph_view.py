@@ -0,0 +1,104 @@
+import tkinter as tk
+
+import networkx as nx
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
+
+from visualizer import draw_graph_artists, update_graph_artists
+
+
+class GraphWindow:
+    """
+    Window with an interactive matplotlib canvas showing a blocker graph.
+
+    The toolbar provides pan, zoom and saving to a file. Hovering a node shows its tooltip.
+    Once a graph is shown, update_positions moves the existing artists instead of drawing the
+    whole figure again.
+    """
+
+    def __init__(self, parent):
+        self.top = tk.Toplevel(parent)
+        self.top.title("Jira Blocker Chains")
+        self.top.geometry("1000x800")
+        self.top.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.figure = Figure(figsize=(12, 10))
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.top)
+        toolbar = NavigationToolbar2Tk(self.canvas, self.top)
+        toolbar.update()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
+
+        # The GUI session whose graph is shown
+        self.session = None
+        self.artists = None
+        self.tooltips: dict = {}
+        self.tooltip = None
+        self.is_open = True
+
+    def show_graph(
+        self, graph: nx.DiGraph, drawing: dict, node_sizes: dict, sprint_codes: str, tooltips: dict
+    ):
+        """
+        Draw a graph, replacing whatever the window showed before.
+
+        Args:
+            graph: NetworkX DiGraph of blocker relationships
+            drawing: Dictionary returned by visualizer.prepare_graph_drawing
+            node_sizes: Dictionary of node sizes
+            sprint_codes: Sprint code(s) as a string (comma-separated if multiple)
+            tooltips: Dictionary of tooltip text for each node
+        """
+        self.ax.clear()
+        self.artists = draw_graph_artists(
+            self.ax,
+            graph,
+            drawing["node_pos"],
+            drawing["node_colors"],
+            node_sizes,
+            sprint_codes,
+            drawing["parent_colors"],
+            drawing["parent_names"],
+            drawing["clusters"],
+        )
+        self.tooltips = tooltips
+        self.tooltip = self.ax.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(15, 15),
+            textcoords="offset points",
+            bbox={"boxstyle": "round", "fc": "lightyellow", "ec": "gray"},
+            fontsize=9,
+            zorder=10,
+        )
+        self.tooltip.set_visible(False)
+        self.canvas.draw_idle()
+        self.top.lift()
+
+    def update_positions(self, node_pos: dict, clusters: dict):
+        """Move the nodes, edges, labels and cluster circles of the shown graph"""
+        if self.artists is None:
+            return
+        update_graph_artists(self.ax, self.artists, node_pos, clusters)
+        self.tooltip.set_visible(False)
+        self.canvas.draw_idle()
+
+    def on_hover(self, event):
+        """Show the tooltip of the node under the cursor"""
+        if self.artists is None:
+            return
+        contains, details = self.artists["nodes"].contains(event)
+        if event.inaxes == self.ax and contains:
+            node = self.artists["nodelist"][details["ind"][0]]
+            self.tooltip.xy = self.artists["nodes"].get_offsets()[details["ind"][0]]
+            self.tooltip.set_text(self.tooltips.get(node, node))
+            self.tooltip.set_visible(True)
+            self.canvas.draw_idle()
+        elif self.tooltip.get_visible():
+            self.tooltip.set_visible(False)
+            self.canvas.draw_idle()
+
+    def close(self):
+        self.is_open = False
+        self.top.destroy()
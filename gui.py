@@ -1,14 +1,53 @@
 import os
 import threading
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
 
 from dotenv import load_dotenv
 
-from config import CLUSTER_K_DIST, CLUSTER_LAYOUT, NODE_K_DIST, NODE_LAYOUT
+from config import (
+    CLUSTER_K_DIST,
+    CLUSTER_LAYOUT,
+    LAYOUT_ALGORITHMS,
+    NODE_K_DIST,
+    NODE_LAYOUT,
+    PERFORMANCE_PROFILES,
+    PROFILE_MODE,
+    TEAM_OPTIONS,
+)
 from graph_builder import build_blocker_graph
+from graph_view import GraphWindow
 from jira_client import JiraClient
-from visualizer import visualize_graph
+from visualizer import layout_graph, prepare_graph_drawing
+
+
+class GenerationCancelled(Exception):
+    """Raised in the background thread when the user cancels graph generation"""
+
+
+# Runs fn in a helper thread and waits for its result, raising GenerationCancelled as soon as
+# cancel_event is set. A cancelled call keeps running (other callers may share its Jira
+# requests) and its result is dropped
+def _run_cancellable(fn, cancel_event):
+    outcome: dict = {}
+    done = threading.Event()
+
+    def run():
+        try:
+            outcome["result"] = fn()
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    while not done.wait(0.1):
+        if cancel_event.is_set():
+            raise GenerationCancelled()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
 
 
 class LoadingWindow:
@@ -23,7 +62,7 @@ class LoadingWindow:
         parent_height = parent.winfo_height()
 
         width = 300
-        height = 100
+        height = 150
         x = parent_x + (parent_width // 2) - (width // 2)
         y = parent_y + (parent_height // 2) - (height // 2)
 
@@ -32,18 +71,36 @@ class LoadingWindow:
         self.top.transient(parent)
         self.top.grab_set()
 
-        # Remove close button
-        self.top.protocol("WM_DELETE_WINDOW", lambda: None)
+        # Closing the window cancels, just like the Cancel button
+        self.cancel_event = threading.Event()
+        self.top.protocol("WM_DELETE_WINDOW", self.cancel)
 
         # Message
-        tk.Label(self.top, text=message, padx=20, pady=10).pack()
+        self.message = tk.Label(self.top, text=message, padx=20, pady=10)
+        self.message.pack()
 
         # Progress indicator
         self.progress = ttk.Progressbar(
-            self.top, orient="horizontal", length=250, mode="indeterminate"
+            self.top, orient="horizontal", length=250, mode="determinate", maximum=100
         )
-        self.progress.pack(padx=20, pady=10)
-        self.progress.start(10)
+        self.progress.pack(padx=20, pady=5)
+
+        self.cancel_button = ttk.Button(self.top, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(pady=5)
+
+    def set_progress(self, percent, message=None):
+        """Update the progress bar (0-100) and optionally the message"""
+        if not self.top.winfo_exists():
+            return
+        self.progress["value"] = percent
+        if message:
+            self.message.config(text=message)
+
+    def cancel(self):
+        """Ask the background thread to stop at its next checkpoint"""
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.message.config(text="Cancelling...")
 
     def close(self):
         self.top.grab_release()
@@ -51,29 +108,28 @@ class LoadingWindow:
 
 
 class JiraBlockerChainGUI:
-    def __init__(self, root):
+    def __init__(self, root, profile_mode=PROFILE_MODE):
         self.root = root
         self.root.title("Jira Blocker Chain")
-        self.root.geometry("500x480")
+        self.root.geometry("500x510")
 
         self.env_vars = self.load_env_variables()
 
+        # Fetched data for the last project/team/sprint scope, so layout-only changes can be
+        # rendered again without going back to Jira
+        self.session = None
+
+        # Interactive graph window, and the state used to re-layout it when settings change
+        self.graph_window = None
+        self.relayout_job = None
+        self.relayout_running = False
+        self.relayout_pending = False
+
         # Team GUIDs for dropdown
-        self.team_options = {
-            "Armadillo": "cea040b4-0710-4359-b46d-f9b64c27ef36",
-            "Backpack": "a4bb26c1-324e-4218-9120-feda39ca1279",
-            "AI": "34fdd1e2-222f-4962-9413-522537118a1a",
-            "Data": "9acb7f88-e87e-4c61-8e8a-65cdf8e00e88",
-        }
+        self.team_options = dict(TEAM_OPTIONS)
 
         # Layout options
-        self.layout_options = [
-            "kamada-kawai",
-            "spring",
-            "fruchterman_reingold",
-            "circular",
-            "planar",
-        ]
+        self.layout_options = list(LAYOUT_ALGORITHMS)
 
         # Create main frame
         main_frame = ttk.Frame(root, padding=20)
@@ -139,6 +195,7 @@ class JiraBlockerChainGUI:
             state="readonly",
         )
         self.cluster_layout_combo.grid(column=1, row=0, sticky=tk.W)
+        self.cluster_layout_combo.bind("<<ComboboxSelected>>", lambda e: self.schedule_relayout())
 
         # Node Layout
         ttk.Label(viz_frame, text="Node Layout:").grid(column=0, row=1, sticky=tk.W, pady=5)
@@ -151,6 +208,7 @@ class JiraBlockerChainGUI:
             state="readonly",
         )
         self.node_layout_combo.grid(column=1, row=1, sticky=tk.W)
+        self.node_layout_combo.bind("<<ComboboxSelected>>", lambda e: self.schedule_relayout())
 
         # Cluster K Distance
         ttk.Label(viz_frame, text="Cluster K Distance:").grid(column=0, row=2, sticky=tk.W, pady=5)
@@ -183,12 +241,25 @@ class JiraBlockerChainGUI:
         self.node_k_label.grid(column=2, row=3, sticky=tk.W, padx=10)
         self.node_k_scale.config(command=lambda x: self.update_k_label("node", x))
 
+        # Performance Profile
+        ttk.Label(viz_frame, text="Performance:").grid(column=0, row=4, sticky=tk.W, pady=5)
+        self.profile_var = tk.StringVar(value=profile_mode)
+        self.profile_combo = ttk.Combobox(
+            viz_frame,
+            textvariable=self.profile_var,
+            values=list(PERFORMANCE_PROFILES),
+            width=18,
+            state="readonly",
+        )
+        self.profile_combo.grid(column=1, row=4, sticky=tk.W)
+        self.profile_combo.bind("<<ComboboxSelected>>", lambda e: self.schedule_relayout())
+
         # Add layout help text
         layout_help = (
             "Different layouts work better for different graphs. Try various combinations."
         )
         ttk.Label(viz_frame, text=layout_help, foreground="gray", font=("Arial", 8)).grid(
-            column=0, row=4, columnspan=3, sticky=tk.W
+            column=0, row=5, columnspan=3, sticky=tk.W
         )
 
         # Button frame
@@ -198,6 +269,11 @@ class JiraBlockerChainGUI:
         ttk.Button(button_frame, text="Generate Graph", command=self.on_generate_click).pack(
             side=tk.LEFT, padx=5
         )
+        ttk.Button(
+            button_frame,
+            text="Refresh from Jira",
+            command=lambda: self.on_generate_click(refresh=True),
+        ).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Exit", command=root.destroy).pack(side=tk.RIGHT, padx=5)
 
         # Add help text
@@ -211,6 +287,7 @@ class JiraBlockerChainGUI:
             self.cluster_k_label.config(text=f"{value:.1f}")
         else:
             self.node_k_label.config(text=f"{value:.1f}")
+        self.schedule_relayout()
 
     def load_env_variables(self):
         """Load environment variables from .env file"""
@@ -232,8 +309,23 @@ class JiraBlockerChainGUI:
 
         return env_vars
 
-    def on_generate_click(self):
-        """Handle generate button click by validating inputs and starting the background process"""
+    def get_layout_settings(self):
+        """Get the layout settings currently selected in the form"""
+        return {
+            "cluster_layout": self.cluster_layout_var.get(),
+            "node_layout": self.node_layout_var.get(),
+            "cluster_k": self.cluster_k_var.get(),
+            "node_k": self.node_k_var.get(),
+            "profile": self.profile_var.get(),
+        }
+
+    def on_generate_click(self, refresh=False):
+        """
+        Handle generate button click by validating inputs and starting the background process.
+
+        Data already fetched for the same project, team and sprints is reused unless refresh
+        is True, so layout changes only re-run layout and rendering.
+        """
         # Validate required fields
         project_key = self.project_key.get().strip()
         team_name = self.team_var.get()
@@ -258,59 +350,129 @@ class JiraBlockerChainGUI:
                 )
                 return
 
-        # Get layout settings
-        layout_settings = {
-            "cluster_layout": self.cluster_layout_var.get(),
-            "node_layout": self.node_layout_var.get(),
-            "cluster_k": self.cluster_k_var.get(),
-            "node_k": self.node_k_var.get(),
-        }
+        layout_settings = self.get_layout_settings()
+
+        scope = (project_key, team_guid, sprint_codes)
+        session = None if refresh else self.session
+        if session is not None and session["scope"] != scope:
+            session = None
+
+        if session is None:
+            message = "Fetching data and generating graph...\nThis may take a moment."
+        else:
+            message = "Generating graph..."
+        self.loading_window = LoadingWindow(self.root, message)
 
         # Start the processing in a separate thread with a loading window
         thread = threading.Thread(
             target=self.generate_graph_thread,
-            args=(project_key, team_guid, sprint_codes, layout_settings),
+            args=(
+                project_key,
+                team_guid,
+                sprint_codes,
+                layout_settings,
+                session,
+                self.loading_window,
+            ),
             daemon=True,
         )
-
-        self.loading_window = LoadingWindow(
-            self.root, "Fetching data and generating graph...\nThis may take a moment."
-        )
-
         thread.start()
 
-    def generate_graph_thread(self, project_key, team_guid, sprint_codes, layout_settings):
-        """Generate the graph in a background thread to keep UI responsive"""
+    def generate_graph_thread(
+        self,
+        project_key,
+        team_guid,
+        sprint_codes,
+        layout_settings,
+        session=None,
+        loading_window=None,
+    ):
+        """
+        Generate the graph in a background thread to keep UI responsive.
+
+        When a session from a previous run is given, its fetched issues and graph are reused
+        instead of fetching from Jira again. Progress is reported to the loading window, and
+        its cancel button stops the thread at the next checkpoint.
+        """
         result = None
         error = None
+        started_at = time.perf_counter()
 
-        try:
-            # Create Jira client using environment credentials
-            jira_client = JiraClient()
-
-            # Generate graph using form values directly (not from environment)
-            issues = jira_client.fetch_issues(project_key, sprint_codes, team_guid)
-            graph, issues_in_chains, node_sizes = build_blocker_graph(issues)
-            chain_graph = graph.subgraph(issues_in_chains)
-
-            # Save the graph to a file with custom layout settings
-            saved_file = visualize_graph(
-                chain_graph,
-                issues,
-                node_sizes,
-                jira_client,
-                sprint_codes,
-                save_file=True,
-                layout_settings=layout_settings,
-            )
-            result = saved_file
+        cancel_event = loading_window.cancel_event if loading_window else threading.Event()
+
+        def show_progress(percent, message=None):
+            if loading_window is not None and not cancel_event.is_set():
+                self.root.after(0, lambda: loading_window.set_progress(percent, message))
+
+        def report_progress(percent, message=None):
+            if cancel_event.is_set():
+                raise GenerationCancelled()
+            show_progress(percent, message)
 
+        def report_fetch_progress(fetched, total):
+            # Fetching is the slow part, it takes the first 60% of the bar. This runs inside a
+            # fetch that may be shared with other callers, so it must not raise
+            percent = 60 * fetched / total if total else 60
+            show_progress(percent, f"Fetched {fetched} of {total} issues...")
+
+        try:
+            if session is None:
+                # Create Jira client using environment credentials, it is kept with the session
+                # so parent summaries are only fetched once
+                jira_client = JiraClient.from_profile(layout_settings["profile"])
+
+                # Generate graph using form values directly (not from environment)
+                report_progress(0, "Fetching issues from Jira...")
+                issues = _run_cancellable(
+                    lambda: jira_client.fetch_issues(
+                        project_key,
+                        sprint_codes,
+                        team_guid,
+                        progress_callback=report_fetch_progress,
+                    ),
+                    cancel_event,
+                )
+                report_progress(60, "Building blocker graph...")
+                graph, _, node_sizes = build_blocker_graph(issues)
+                session = {
+                    "scope": (project_key, team_guid, sprint_codes),
+                    "jira_client": jira_client,
+                    "issues": issues,
+                    "chain_graph": graph,
+                    "node_sizes": node_sizes,
+                    "position_cache": {},
+                    # Generation and re-layout threads both update the position cache
+                    "layout_lock": threading.Lock(),
+                }
+                self.session = session
+
+            if session["chain_graph"].number_of_nodes() > 0:
+                report_progress(70, "Calculating layout...")
+                with session["layout_lock"]:
+                    drawing = prepare_graph_drawing(
+                        session["chain_graph"],
+                        session["issues"],
+                        session["jira_client"],
+                        layout_settings=layout_settings,
+                        position_cache=session["position_cache"],
+                    )
+                report_progress(95, "Drawing graph...")
+                result = (session, drawing, time.perf_counter() - started_at)
+
+        except GenerationCancelled:
+            self.root.after(0, self.on_process_cancelled)
+            return
         except Exception as e:
             error = str(e)
 
         # Use after method to schedule UI updates on the main thread
         self.root.after(100, lambda: self.on_process_complete(result, error))
 
+    def on_process_cancelled(self):
+        """Handle a graph generation process stopped by the user"""
+        if hasattr(self, "loading_window"):
+            self.loading_window.close()
+
     def on_process_complete(self, result, error):
         """Handle the completion of graph generation process"""
         # Close the loading window
@@ -321,6 +483,102 @@ class JiraBlockerChainGUI:
         if error:
             messagebox.showerror("Error", f"An error occurred: {error}")
         elif result:
-            messagebox.showinfo("Success", f"Graph generated and saved to:\n\n{result}")
+            session, drawing, elapsed = result
+            self.show_graph(session, drawing)
+            self.report_run_time(elapsed)
         else:
             messagebox.showinfo("Information", "No blocker chains found in the specified sprints.")
+
+    def show_graph(self, session, drawing):
+        """Show a graph in the interactive graph window, opening it if needed"""
+        if self.graph_window is None or not self.graph_window.is_open:
+            self.graph_window = GraphWindow(self.root)
+
+        parent_names = drawing["parent_names"]
+        tooltips = {}
+        for issue in session["issues"]:
+            key = issue["key"]
+            if key not in session["chain_graph"]:
+                continue
+            fields = issue["fields"]
+            tooltip = f"{key}: {fields.get('summary', '')}"
+            parent_key = (fields.get("parent") or {}).get("key")
+            if parent_key:
+                tooltip += f"\nParent: {parent_names.get(parent_key, parent_key)} ({parent_key})"
+            tooltips[key] = tooltip
+
+        self.graph_window.show_graph(
+            session["chain_graph"],
+            drawing,
+            session["node_sizes"],
+            session["scope"][2],
+            tooltips,
+        )
+        self.graph_window.session = session
+
+    def report_run_time(self, elapsed):
+        """Show how long the last generation or re-layout took in the graph window title"""
+        message = f"{elapsed:.2f} seconds ({self.profile_var.get()} profile)"
+        print(f"Run took {message}")
+        if self.graph_window is not None and self.graph_window.is_open:
+            self.graph_window.top.title(f"Jira Blocker Chains - {message}")
+
+    def schedule_relayout(self):
+        """Re-layout the shown graph shortly after the layout settings stop changing"""
+        if self.relayout_job is not None:
+            self.root.after_cancel(self.relayout_job)
+        self.relayout_job = self.root.after(200, self.start_relayout)
+
+    def start_relayout(self):
+        """Start re-laying out the graph shown in the graph window with the current settings"""
+        self.relayout_job = None
+        if self.graph_window is None or not self.graph_window.is_open:
+            return
+        if self.relayout_running:
+            # Only one layout runs at a time, the latest settings are applied when it finishes
+            self.relayout_pending = True
+            return
+
+        self.relayout_running = True
+        thread = threading.Thread(
+            target=self.relayout_thread,
+            args=(self.graph_window.session, self.get_layout_settings()),
+            daemon=True,
+        )
+        thread.start()
+
+    def relayout_thread(self, session, layout_settings):
+        """Calculate new node positions in a background thread"""
+        clusters, node_pos, error = None, None, None
+        started_at = time.perf_counter()
+        try:
+            with session["layout_lock"]:
+                clusters, node_pos = layout_graph(
+                    session["chain_graph"],
+                    session["issues"],
+                    layout_settings=layout_settings,
+                    position_cache=session["position_cache"],
+                )
+        except Exception as e:
+            error = str(e)
+        elapsed = time.perf_counter() - started_at
+        self.root.after(
+            0, lambda: self.on_relayout_complete(session, clusters, node_pos, error, elapsed)
+        )
+
+    def on_relayout_complete(self, session, clusters, node_pos, error, elapsed):
+        """Move the graph's artists to the new positions"""
+        self.relayout_running = False
+        if error:
+            messagebox.showerror("Error", f"An error occurred: {error}")
+        elif (
+            self.graph_window is not None
+            and self.graph_window.is_open
+            and self.graph_window.session is session
+        ):
+            self.graph_window.update_positions(node_pos, clusters)
+            self.report_run_time(elapsed)
+
+        if self.relayout_pending:
+            self.relayout_pending = False
+            self.start_relayout()
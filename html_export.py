@@ -0,0 +1,460 @@
+import datetime
+import html
+import json
+import os
+import typing
+
+import networkx as nx
+from matplotlib.colors import to_hex
+
+from config import DEFAULT_DOT_SIZE
+from jira_client import JiraClient
+from visualizer import format_graph_title, prepare_graph_styles
+
+# Page template. The graph data is embedded as JSON, and the script lays it out and draws it
+# on a canvas, so the file works offline without any other assets.
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  html, body { margin: 0; height: 100%; font-family: sans-serif; overflow: hidden; }
+  #graph { display: block; width: 100%; height: 100%; cursor: grab; }
+  #title { position: absolute; top: 8px; left: 0; right: 0; text-align: center;
+           font-size: 16px; pointer-events: none; }
+  #controls { position: absolute; top: 8px; left: 8px; }
+  #legend { position: absolute; top: 8px; right: 8px; max-height: 80%; overflow-y: auto;
+            background: rgba(255, 255, 255, 0.9); border: 1px solid #ccc; padding: 6px;
+            font-size: 12px; }
+  #legend div { margin: 2px 0; white-space: nowrap; }
+  #legend span { display: inline-block; width: 12px; height: 12px; margin-right: 6px;
+                 vertical-align: middle; }
+  #tooltip { position: absolute; display: none; pointer-events: none; padding: 4px 6px;
+             background: lightyellow; border: 1px solid gray; border-radius: 4px;
+             font-size: 12px; }
+</style>
+</head>
+<body>
+<canvas id="graph"></canvas>
+<div id="title"></div>
+<div id="controls">
+  <button id="relayout">Re-run layout</button>
+  <button id="fit">Fit</button>
+</div>
+<div id="legend"><b>Parent Issues</b></div>
+<div id="tooltip"></div>
+<script type="application/json" id="graph-data">__GRAPH_DATA__</script>
+<script>
+(function () {
+  "use strict";
+  var data = JSON.parse(document.getElementById("graph-data").textContent);
+  var K = 40;  // Ideal distance between linked tickets, in layout units
+  var nodes = data.nodes, edges = data.edges, n = nodes.length;
+  var x = new Float64Array(n), y = new Float64Array(n);
+  var dx = new Float64Array(n), dy = new Float64Array(n), radius = new Float64Array(n);
+  var clusterIndex = {}, members = [];
+  data.clusters.forEach(function (cluster, c) { clusterIndex[cluster.key] = c; members.push([]); });
+  nodes.forEach(function (node, i) {
+    node.cluster = clusterIndex[node.parent];
+    members[node.cluster].push(i);
+    radius[i] = 8 * Math.sqrt(node.size / data.default_size);
+  });
+
+  // Starting positions: the precomputed ones scaled to layout units, otherwise each cluster
+  // on a sunflower spiral with its tickets on a smaller spiral around the cluster center
+  function seedPositions() {
+    var GOLDEN_ANGLE = 2.399963;
+    if (data.positioned) {
+      var minX = Infinity, maxX = -Infinity, minY = Infinity, maxY = -Infinity;
+      nodes.forEach(function (node) {
+        minX = Math.min(minX, node.x); maxX = Math.max(maxX, node.x);
+        minY = Math.min(minY, node.y); maxY = Math.max(maxY, node.y);
+      });
+      var scale = K * 2 * Math.sqrt(n) / Math.max(maxX - minX, maxY - minY, 1e-9);
+      nodes.forEach(function (node, i) { x[i] = node.x * scale; y[i] = -node.y * scale; });
+      return;
+    }
+    var placed = 0;
+    members.forEach(function (cluster, c) {
+      var distance = K * 1.5 * Math.sqrt(placed + cluster.length / 2);
+      var centerX = distance * Math.cos(c * GOLDEN_ANGLE);
+      var centerY = distance * Math.sin(c * GOLDEN_ANGLE);
+      placed += cluster.length;
+      cluster.forEach(function (i, j) {
+        var r = K * 0.6 * Math.sqrt(j);
+        x[i] = centerX + r * Math.cos(j * GOLDEN_ANGLE);
+        y[i] = centerY + r * Math.sin(j * GOLDEN_ANGLE);
+      });
+    });
+  }
+
+  // One step of a force-directed layout. Repulsion only looks at tickets in neighbouring
+  // grid cells and clusters only look at each other's bounding circles, so a step stays
+  // close to linear in the number of tickets.
+  function layoutStep(temperature) {
+    var i, j, c;
+    dx.fill(0); dy.fill(0);
+    var cell = K * 2, grid = new Map();
+    for (i = 0; i < n; i++) {
+      var cellKey = Math.floor(x[i] / cell) + "," + Math.floor(y[i] / cell);
+      if (!grid.has(cellKey)) grid.set(cellKey, []);
+      grid.get(cellKey).push(i);
+    }
+    for (i = 0; i < n; i++) {
+      var cx = Math.floor(x[i] / cell), cy = Math.floor(y[i] / cell);
+      for (var gx = cx - 1; gx <= cx + 1; gx++) {
+        for (var gy = cy - 1; gy <= cy + 1; gy++) {
+          var neighbours = grid.get(gx + "," + gy);
+          if (!neighbours) continue;
+          for (var m = 0; m < neighbours.length; m++) {
+            j = neighbours[m];
+            if (j === i) continue;
+            var rx = x[i] - x[j], ry = y[i] - y[j];
+            var d2 = rx * rx + ry * ry || 0.01;
+            dx[i] += rx * K * K / d2; dy[i] += ry * K * K / d2;
+          }
+        }
+      }
+    }
+    edges.forEach(function (edge) {
+      var s = edge[0], t = edge[1];
+      var rx = x[t] - x[s], ry = y[t] - y[s];
+      var d = Math.sqrt(rx * rx + ry * ry) || 0.1;
+      var f = d / K;
+      dx[s] += rx * f; dy[s] += ry * f; dx[t] -= rx * f; dy[t] -= ry * f;
+    });
+
+    // Pull tickets towards their cluster center so each parent stays together
+    var circles = clusterCircles();
+    members.forEach(function (cluster, c) {
+      cluster.forEach(function (i) {
+        dx[i] += (circles[c].x - x[i]) * 0.1 * K / Math.max(circles[c].r, K);
+        dy[i] += (circles[c].y - y[i]) * 0.1 * K / Math.max(circles[c].r, K);
+      });
+    });
+    for (i = 0; i < n; i++) {
+      var length = Math.sqrt(dx[i] * dx[i] + dy[i] * dy[i]);
+      if (length > 0) {
+        var step = Math.min(length, temperature) / length;
+        x[i] += dx[i] * step; y[i] += dy[i] * step;
+      }
+    }
+
+    // Push overlapping clusters apart as a whole
+    circles = clusterCircles();
+    for (c = 0; c < circles.length; c++) {
+      for (var o = c + 1; o < circles.length; o++) {
+        var ox = circles[o].x - circles[c].x, oy = circles[o].y - circles[c].y;
+        var dist = Math.sqrt(ox * ox + oy * oy) || 0.1;
+        var overlap = circles[c].r + circles[o].r + K - dist;
+        if (overlap > 0) {
+          var mx = ox / dist * overlap / 2, my = oy / dist * overlap / 2;
+          members[c].forEach(function (i) { x[i] -= mx; y[i] -= my; });
+          members[o].forEach(function (i) { x[i] += mx; y[i] += my; });
+          circles[c].x -= mx; circles[c].y -= my; circles[o].x += mx; circles[o].y += my;
+        }
+      }
+    }
+  }
+
+  function clusterCircles() {
+    return members.map(function (cluster) {
+      var sx = 0, sy = 0, r = 0;
+      cluster.forEach(function (i) { sx += x[i]; sy += y[i]; });
+      sx /= cluster.length; sy /= cluster.length;
+      cluster.forEach(function (i) {
+        r = Math.max(r, Math.sqrt((x[i] - sx) * (x[i] - sx) + (y[i] - sy) * (y[i] - sy)));
+      });
+      return { x: sx, y: sy, r: r * 1.2 + K / 2 };
+    });
+  }
+
+  var canvas = document.getElementById("graph"), ctx = canvas.getContext("2d");
+  var view = { scale: 1, x: 0, y: 0 }, temperature = 0, running = false;
+
+  function resize() {
+    var ratio = window.devicePixelRatio || 1;
+    canvas.width = canvas.clientWidth * ratio;
+    canvas.height = canvas.clientHeight * ratio;
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    draw();
+  }
+
+  function fit() {
+    var minX = Infinity, maxX = -Infinity, minY = Infinity, maxY = -Infinity;
+    clusterCircles().forEach(function (c) {
+      minX = Math.min(minX, c.x - c.r); maxX = Math.max(maxX, c.x + c.r);
+      minY = Math.min(minY, c.y - c.r); maxY = Math.max(maxY, c.y + c.r);
+    });
+    var width = canvas.clientWidth, height = canvas.clientHeight - 40;
+    view.scale = Math.min(width / (maxX - minX || 1), height / (maxY - minY || 1)) * 0.95;
+    view.x = width / 2 - (minX + maxX) / 2 * view.scale;
+    view.y = 40 + height / 2 - (minY + maxY) / 2 * view.scale;
+    draw();
+  }
+
+  function draw() {
+    ctx.clearRect(0, 0, canvas.clientWidth, canvas.clientHeight);
+    ctx.save();
+    ctx.translate(view.x, view.y);
+    ctx.scale(view.scale, view.scale);
+    ctx.lineWidth = 1 / view.scale;
+
+    ctx.setLineDash([6 / view.scale, 4 / view.scale]);
+    ctx.strokeStyle = "gray";
+    clusterCircles().forEach(function (c) {
+      ctx.beginPath(); ctx.arc(c.x, c.y, c.r, 0, 2 * Math.PI); ctx.stroke();
+    });
+    ctx.setLineDash([]);
+
+    ctx.strokeStyle = ctx.fillStyle = "black";
+    ctx.beginPath();
+    edges.forEach(function (edge) {
+      var s = edge[0], t = edge[1];
+      var ex = x[t] - x[s], ey = y[t] - y[s], d = Math.sqrt(ex * ex + ey * ey) || 1;
+      var ux = ex / d, uy = ey / d, tipX = x[t] - ux * radius[t], tipY = y[t] - uy * radius[t];
+      var head = Math.min(8, d / 3);
+      ctx.moveTo(x[s], y[s]); ctx.lineTo(tipX, tipY);
+      ctx.moveTo(tipX - ux * head - uy * head / 2, tipY - uy * head + ux * head / 2);
+      ctx.lineTo(tipX, tipY);
+      ctx.lineTo(tipX - ux * head + uy * head / 2, tipY - uy * head - ux * head / 2);
+    });
+    ctx.stroke();
+
+    nodes.forEach(function (node, i) {
+      ctx.fillStyle = node.color;
+      ctx.beginPath(); ctx.arc(x[i], y[i], radius[i], 0, 2 * Math.PI); ctx.fill();
+    });
+
+    // Labels only once they are large enough to read
+    if (view.scale * 8 >= 6) {
+      ctx.fillStyle = "black";
+      ctx.textAlign = "center"; ctx.textBaseline = "middle";
+      ctx.font = "8px sans-serif";
+      nodes.forEach(function (node, i) { ctx.fillText(node.key, x[i], y[i]); });
+    }
+    ctx.restore();
+  }
+
+  // Runs layout steps for a few milliseconds per frame, cooling until the layout settles
+  function animate() {
+    var start = performance.now();
+    while (temperature > 0.2 && performance.now() - start < 15) {
+      layoutStep(temperature);
+      temperature *= 0.97;
+    }
+    draw();
+    if (temperature > 0.2) {
+      requestAnimationFrame(animate);
+    } else {
+      running = false;
+    }
+  }
+
+  function startLayout(initialTemperature) {
+    temperature = initialTemperature;
+    if (!running) {
+      running = true;
+      requestAnimationFrame(animate);
+    }
+  }
+
+  function nodeAt(screenX, screenY) {
+    var wx = (screenX - view.x) / view.scale, wy = (screenY - view.y) / view.scale;
+    var best = -1, bestDistance = Infinity;
+    for (var i = 0; i < n; i++) {
+      var d = (x[i] - wx) * (x[i] - wx) + (y[i] - wy) * (y[i] - wy);
+      if (d <= radius[i] * radius[i] && d < bestDistance) { best = i; bestDistance = d; }
+    }
+    return best;
+  }
+
+  var tooltip = document.getElementById("tooltip"), drag = null;
+  canvas.addEventListener("mousedown", function (event) {
+    drag = { x: event.clientX - view.x, y: event.clientY - view.y };
+    canvas.style.cursor = "grabbing";
+  });
+  window.addEventListener("mouseup", function () { drag = null; canvas.style.cursor = "grab"; });
+  canvas.addEventListener("mousemove", function (event) {
+    if (drag) {
+      view.x = event.clientX - drag.x; view.y = event.clientY - drag.y;
+      tooltip.style.display = "none";
+      draw();
+      return;
+    }
+    var i = nodeAt(event.clientX, event.clientY);
+    if (i < 0) { tooltip.style.display = "none"; return; }
+    var cluster = data.clusters[nodes[i].cluster];
+    tooltip.textContent = nodes[i].key + (nodes[i].summary ? ": " + nodes[i].summary : "") +
+      (cluster.key !== "orphan" ? " (" + cluster.name + ")" : "");
+    tooltip.style.left = event.clientX + 15 + "px";
+    tooltip.style.top = event.clientY + 15 + "px";
+    tooltip.style.display = "block";
+  });
+  canvas.addEventListener("wheel", function (event) {
+    event.preventDefault();
+    var factor = Math.exp(-event.deltaY * 0.001);
+    view.x = event.clientX - (event.clientX - view.x) * factor;
+    view.y = event.clientY - (event.clientY - view.y) * factor;
+    view.scale *= factor;
+    draw();
+  }, { passive: false });
+  window.addEventListener("resize", resize);
+  document.getElementById("fit").addEventListener("click", fit);
+  document.getElementById("relayout").addEventListener("click", function () {
+    seedPositions(); fit(); startLayout(K);
+  });
+
+  document.getElementById("title").textContent = data.title;
+  var legend = document.getElementById("legend");
+  data.clusters.forEach(function (cluster) {
+    if (cluster.key === "orphan") return;
+    var row = document.createElement("div"), swatch = document.createElement("span");
+    swatch.style.background = cluster.color;
+    row.appendChild(swatch);
+    row.appendChild(document.createTextNode(cluster.name + " (" + cluster.key + ")"));
+    legend.appendChild(row);
+  });
+
+  seedPositions();
+  resize();
+  fit();
+  // Precomputed positions only need a light touch, anything else a full layout
+  startLayout(data.positioned ? K / 8 : K);
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def build_html_data(
+    graph: nx.DiGraph,
+    issues: list,
+    node_sizes: dict,
+    jira_client: typing.Optional[JiraClient],
+    sprint_codes: str,
+    node_pos=None,
+    parent_names=None,
+    team_name=None,
+    title=None,
+) -> dict:
+    """
+    Build the data embedded in an HTML export.
+
+    Args:
+        graph: NetworkX DiGraph of blocker relationships
+        issues: List of Jira issues
+        node_sizes: Dictionary of node sizes
+        jira_client: JiraClient instance (may be None when parent_names covers every parent)
+        sprint_codes: Sprint code(s) as a string (comma-separated if multiple)
+        node_pos: Optional dictionary of precomputed node positions. The browser only refines
+            them when every node has one, and lays the graph out from scratch otherwise.
+        parent_names: Optional dictionary of parent summaries fetched beforehand
+        team_name: Optional team name added to the title
+        title: Optional title used instead of the sprints and team
+
+    Returns:
+        JSON-serializable dictionary with the title, nodes, edges (as node index pairs) and
+        clusters
+    """
+    styles = prepare_graph_styles(graph, issues, jira_client, parent_names=parent_names)
+    node_parents = {
+        node: parent_id for parent_id, nodes in styles["clusters"].items() for node in nodes
+    }
+    summaries = {issue["key"]: issue["fields"].get("summary") for issue in issues}
+    positioned = bool(node_pos) and all(node in node_pos for node in graph)
+
+    nodes = []
+    node_index = {}
+    for node, color in zip(graph.nodes(), styles["node_colors"]):
+        node_index[node] = len(nodes)
+        record = {
+            "key": node,
+            "parent": node_parents[node],
+            "size": node_sizes[node],
+            "color": to_hex(color),
+        }
+        if summaries.get(node):
+            record["summary"] = summaries[node]
+        if positioned:
+            record["x"] = round(float(node_pos[node][0]), 4)
+            record["y"] = round(float(node_pos[node][1]), 4)
+        nodes.append(record)
+
+    return {
+        "title": format_graph_title(sprint_codes, team_name, title=title),
+        "default_size": DEFAULT_DOT_SIZE,
+        "positioned": positioned,
+        "nodes": nodes,
+        "edges": [[node_index[source], node_index[target]] for source, target in graph.edges()],
+        "clusters": [
+            {
+                "key": parent_id,
+                "name": styles["parent_names"].get(parent_id, parent_id),
+                "color": to_hex(styles["parent_colors"].get(parent_id, "lightgray")),
+            }
+            for parent_id in styles["clusters"]
+        ],
+    }
+
+
+def render_html(html_data: dict) -> str:
+    """Render the data from build_html_data as a self-contained HTML page"""
+    # "</" would end the script element early and "<!--" would change how it is parsed.
+    # "\u003c" is the same string in JSON
+    graph_data = json.dumps(html_data, separators=(",", ":")).replace("<", "\\u003c")
+    return _HTML_TEMPLATE.replace("__TITLE__", html.escape(html_data["title"])).replace(
+        "__GRAPH_DATA__", graph_data
+    )
+
+
+def save_html_graph(
+    graph: nx.DiGraph,
+    issues: list,
+    node_sizes: dict,
+    jira_client: typing.Optional[JiraClient],
+    sprint_codes: str,
+    node_pos=None,
+    parent_names=None,
+    team_name=None,
+    title=None,
+) -> typing.Optional[str]:
+    """
+    Save a blocker graph as an interactive HTML page, skipping the server-side layout.
+
+    The arguments are the same as for build_html_data. A given title also names the file.
+
+    Returns:
+        Path to the saved file or None if the graph has no blocker chains
+    """
+    if graph.number_of_nodes() == 0:
+        print("No blocker chains found in the specified sprints.")
+        return None
+
+    page = render_html(
+        build_html_data(
+            graph,
+            issues,
+            node_sizes,
+            jira_client,
+            sprint_codes,
+            node_pos=node_pos,
+            parent_names=parent_names,
+            team_name=team_name,
+            title=title,
+        )
+    )
+
+    output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    sprint_filename = (title or sprint_codes).replace(",", "_").replace(" ", "")
+    if team_name:
+        sprint_filename = f"{team_name.replace(' ', '')}_{sprint_filename}"
+    save_path = os.path.join(output_dir, f"blocker_chain_{sprint_filename}_{timestamp}.html")
+    with open(save_path, "w", encoding="utf-8") as f:
+        f.write(page)
+    print(f"Graph saved to: {save_path}")
+    return save_path
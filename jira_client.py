@@ -1,16 +1,103 @@
 import base64
+import concurrent.futures
+import datetime
+import email.utils
 import json
 import os
+import threading
+import time
+import typing
 import urllib.parse
 
 import requests
 from requests.exceptions import RequestException
 
+from cache import SingleFlight
+from config import (
+    FETCH_WORKERS,
+    JIRA_MAX_RETRIES,
+    JIRA_REQUEST_BURST,
+    JIRA_REQUESTS_PER_SECOND,
+    PERFORMANCE_PROFILES,
+    PROFILE_MODE,
+)
+from query_planner import (
+    build_scope_jql,
+    merge_partitions,
+    plan_page_ranges,
+    plan_scope_queries,
+)
+
+# Number of keys sent in a single `key in (...)` query, keeps the URL well under server limits
+KEY_BATCH_SIZE = 100
+
+# Number of issues requested per page (the maximum Jira allows)
+PAGE_SIZE = 100
+
+# Only the fields the blocker graph is built from, keeps polling payloads small
+GRAPH_FIELDS = "issuelinks,parent,status"
+
+
+# Reads a Retry-After header, given either in seconds or as an HTTP date, falling back to
+# default when it is missing or can't be parsed
+def _retry_delay(retry_after: typing.Optional[str], default: float) -> float:
+    if retry_after is None:
+        return default
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added at a fixed rate up to a maximum burst size. Each request takes one token
+    and waits until a token is available.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, blocking until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 
 class JiraClient:
     jira_base_url = None
 
-    def __init__(self):
+    # Shared by every client, so all threads together stay under Jira's rate limits and
+    # identical requests made at the same time by different threads are only sent once
+    rate_limiter = TokenBucket(JIRA_REQUESTS_PER_SECOND, JIRA_REQUEST_BURST)
+    in_flight = SingleFlight()
+
+    def __init__(self, page_size=PAGE_SIZE, fetch_workers=FETCH_WORKERS):
+        # Issues requested per page, and the default number of parallel queries of fetch_issues
+        self.page_size = page_size
+        self.fetch_workers = fetch_workers
+
         jira_api_token = os.getenv("JIRA_API_TOKEN")
         jira_username = os.getenv("JIRA_USERNAME")
         self.jira_base_url = os.getenv("JIRA_BASE_URL")
@@ -24,89 +111,306 @@ class JiraClient:
             ),
         }
 
-    def fetch_issues(self, project_key: str, sprint_codes: str, team_guid: str) -> list:
+        # Parent summaries rarely change, so they are kept for the lifetime of the client
+        self.parent_summary_cache: typing.Dict[str, str] = {}
+
+    @classmethod
+    def from_profile(cls, profile_mode=PROFILE_MODE) -> "JiraClient":
+        """Create a client with the page size and fetch concurrency of a performance profile"""
+        profile = PERFORMANCE_PROFILES[profile_mode]
+        return cls(page_size=profile["page_size"], fetch_workers=profile["fetch_workers"])
+
+    def fetch_issues(
+        self,
+        project_key: str,
+        sprint_codes: str,
+        team_guid: str,
+        fields=None,
+        progress_callback=None,
+        max_workers=None,
+        validate_query="strict",
+    ) -> list:
         """
-        Fetch issues from Jira based on project, sprint(s), and team.
+        Fetch issues from Jira based on project, sprint(s), and team(s).
         Handles pagination to retrieve all matching issues.
 
+        With more than one worker, the scope is split into one query per project and sprint,
+        and the pages of those queries are fetched in parallel. The merged result holds the
+        same issues as the single query, without duplicates. Both return the issues in the
+        order of JQL's ORDER BY key (see query_planner.merge_partitions). A query whose results
+        changed while its pages were fetched is fetched again page by page.
+
         Args:
-            project_key: The Jira project key
+            project_key: The Jira project key, or a comma-separated list of project keys
             sprint_codes: Comma-separated list of sprint codes
-            team_guid: The team's GUID
+            team_guid: The team's GUID, or a comma-separated list of team GUIDs
+            fields: Optional comma-separated list of fields to return (default: all fields)
+            progress_callback: Optional callable receiving (issues fetched, total issues) after
+                each page. Identical fetches made at the same time are shared, and every caller's
+                callback receives the shared fetch's progress, in the thread doing the fetch.
+                Exceptions it raises are printed and don't abort the fetch
+            max_workers: Number of queries run in parallel (1 sends a single query, default:
+                the client's fetch_workers)
+            validate_query: Jira's validateQuery mode ("strict" or "warn")
 
         Returns:
             List of Jira issues
         """
-        # Process the comma-separated sprint codes
-        sprint_codes = sprint_codes.strip()
-        if "," in sprint_codes:
-            # Multiple sprints: sprint in (A, B, C)
-            sprint_parts = [part.strip() for part in sprint_codes.split(",") if part.strip()]
-            sprint_clause = f"sprint in ({', '.join(sprint_parts)})"
-        else:
-            # Single sprint: sprint = X
-            sprint_clause = f"sprint = {sprint_codes}"
-
-        # Build the JQL query with the appropriate sprint clause
-        jql = (
-            f"project = {project_key} AND {sprint_clause} AND "
-            f"Team[Team] = {team_guid} AND status != DONE"
+        if max_workers is None:
+            max_workers = self.fetch_workers
+        if max_workers <= 1:
+            # Build the JQL query with the appropriate project, sprint and team clauses
+            jql = build_scope_jql(project_key, sprint_codes, team_guid)
+            print(f"Executing JQL query: {jql}")
+            issues = self._search_issues(
+                jql, validate_query, fields=fields, progress_callback=progress_callback
+            )
+            # Same order as the partitioned path, whatever order Jira gives projects
+            return merge_partitions([issues])
+
+        queries = plan_scope_queries(project_key, sprint_codes, team_guid)
+        print(f"Executing {len(queries)} partitioned JQL queries with {max_workers} workers")
+        flight_key = self._flight_key("partitioned", tuple(queries), validate_query, fields)
+        issues = self.in_flight.do(
+            flight_key,
+            lambda: self._search_partitioned(
+                queries,
+                validate_query,
+                fields,
+                lambda fetched, total: self.in_flight.notify(flight_key, fetched, total),
+                max_workers,
+            ),
+            listener=progress_callback,
         )
-        print(f"Executing JQL query: {jql}")
+        return list(issues)
+
+    def fetch_issues_by_keys(self, issue_keys: typing.Iterable[str], fields=None) -> list:
+        """
+        Fetch open issues by key using batched `key in (...)` queries.
+
+        Args:
+            issue_keys: Iterable of Jira issue keys
+            fields: Optional comma-separated list of fields to return (default: all fields)
+
+        Returns:
+            List of Jira issues (keys that are DONE or missing are skipped)
+        """
+        keys = sorted(set(issue_keys))
+        all_issues: list = []
+        for i in range(0, len(keys), KEY_BATCH_SIZE):
+            batch = keys[i : i + KEY_BATCH_SIZE]
+            jql = f"key in ({', '.join(batch)}) AND status != DONE"
+            print(f"Executing JQL query: key in (...{len(batch)} keys) AND status != DONE")
+            # Keys that were deleted or moved would fail a strict query, so only warn on them
+            all_issues.extend(self._search_issues(jql, validate_query="warn", fields=fields))
+        return all_issues
+
+    def _get(self, url: str) -> requests.Response:
+        """
+        Send a rate-limited GET request to Jira.
+
+        Throttled (HTTP 429) responses are retried after the delay Jira asks for.
+        """
+        for attempt in range(JIRA_MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            response = requests.get(url, headers=self.headers)
+            if response.status_code != 429 or attempt == JIRA_MAX_RETRIES:
+                break
+            retry_after = _retry_delay(response.headers.get("Retry-After"), 2**attempt)
+            print(f"Jira rate limit hit, retrying in {retry_after:g} seconds")
+            time.sleep(retry_after)
+        response.raise_for_status()
+        return response
 
-        # URL encode the JQL query
-        encoded_jql = urllib.parse.quote(jql)
+    def _flight_key(self, *request: typing.Any) -> tuple:
+        # Requests are only shared between clients using the same site and credentials
+        return (self.jira_base_url, self.headers["Authorization"]) + request
 
+    def _search_issues(
+        self, jql: str, validate_query="strict", fields=None, progress_callback=None
+    ) -> list:
+        """Run a JQL search, sharing the result with identical searches already in flight"""
+        flight_key = self._flight_key("search", jql, validate_query, fields)
+        issues = self.in_flight.do(
+            flight_key,
+            lambda: self._paginate_search(
+                jql,
+                validate_query,
+                fields,
+                lambda fetched, total: self.in_flight.notify(flight_key, fetched, total),
+            ),
+            listener=progress_callback,
+        )
+        # Each caller gets its own list, so callers extending it don't affect each other
+        return list(issues)
+
+    def _paginate_search(
+        self, jql: str, validate_query: str, fields, progress_callback=None
+    ) -> list:
+        """Run a JQL search, following pagination until every matching issue is fetched"""
+        all_issues: list = []
+        for page_issues, total in self.iter_issue_pages(jql, validate_query, fields):
+            all_issues.extend(page_issues)
+            print(f"Fetched {len(page_issues)} issues (total: {len(all_issues)} of {total})")
+            if progress_callback:
+                progress_callback(len(all_issues), total)
+
+        print(f"Successfully fetched all {len(all_issues)} issues")
+        return all_issues
+
+    def iter_issue_pages(
+        self, jql: str, validate_query="strict", fields=None
+    ) -> typing.Iterator[typing.Tuple[list, int]]:
+        """
+        Run a JQL search one page at a time.
+
+        Only one page is held in memory at a time, so very large result sets can be processed
+        as they arrive.
+
+        Yields:
+            Tuples of (issues on the page, total issues matching the query)
+        """
         # Initialize variables for pagination
-        all_issues = []
         start_at = 0
-        max_results = 100  # Maximum allowed by Jira
         total = None
 
         # Fetch all pages of results
         while total is None or start_at < total:
-            url = (
-                f"{self.jira_base_url}/rest/api/2/search?"
-                f"jql={encoded_jql}&startAt={start_at}&maxResults={max_results}"
-            )
+            page_issues, page_total = self._fetch_page(jql, start_at, validate_query, fields)
 
-            try:
-                response = requests.get(url, headers=self.headers)
-                response.raise_for_status()
-                data = response.json()
+            # Get total for pagination
+            if total is None:
+                total = page_total
+                print(f"Total issues matching query: {total}")
 
-                # Get issues from this page
-                page_issues = data.get("issues", [])
-                all_issues.extend(page_issues)
+            # Update for next page
+            start_at += len(page_issues)
+            yield page_issues, total
 
-                # Get total for pagination
-                if total is None:
-                    total = data.get("total", 0)
-                    print(f"Total issues matching query: {total}")
+            # If this page returned fewer results than requested, we're done
+            if len(page_issues) < self.page_size:
+                break
 
-                # Update for next page
-                start_at += len(page_issues)
-                print(f"Fetched {len(page_issues)} issues (total: {len(all_issues)} of {total})")
+    def _fetch_page(
+        self, jql: str, start_at: int, validate_query="strict", fields=None
+    ) -> typing.Tuple[list, int]:
+        """Fetch one page of a JQL search, returning its issues and the total match count"""
+        url = (
+            f"{self.jira_base_url}/rest/api/2/search?"
+            f"jql={urllib.parse.quote(jql)}&startAt={start_at}&maxResults={self.page_size}"
+            f"&validateQuery={validate_query}"
+        )
+        if fields:
+            url += f"&fields={urllib.parse.quote(fields)}"
+
+        try:
+            data = self._get(url).json()
+        except RequestException as e:
+            raise ValueError(f"Error fetching Jira issues: {e}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Error decoding Jira response: {e}")
+        return data.get("issues", []), data.get("total", 0)
 
-                # If this page returned fewer results than requested, we're done
-                if len(page_issues) < max_results:
-                    break
+    def _search_partitioned(
+        self, queries: list, validate_query: str, fields, progress_callback, max_workers: int
+    ) -> list:
+        """Run independent JQL queries in parallel and merge their results"""
+        progress_lock = threading.Lock()
+        progress = {"fetched": 0, "total": 0}
 
-            except RequestException as e:
-                raise ValueError(f"Error fetching Jira issues: {e}")
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Error decoding Jira response: {e}")
+        def report_page(page_issues: list):
+            with progress_lock:
+                progress["fetched"] += len(page_issues)
+                fetched, total = progress["fetched"], progress["total"]
+            print(f"Fetched {len(page_issues)} issues (total: {fetched} of {total})")
+            if progress_callback:
+                progress_callback(fetched, total)
 
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # The first page of every query also tells how many pages remain
+            first_pages = list(
+                executor.map(lambda jql: self._fetch_page(jql, 0, validate_query, fields), queries)
+            )
+            progress["total"] = sum(total for _, total in first_pages)
+            print(f"Total issues matching queries: {progress['total']} (before de-duplication)")
+            for page_issues, _ in first_pages:
+                report_page(page_issues)
+
+            # Queries are ordered by key, so the remaining pages are disjoint key ranges
+            page_futures = []
+            for jql, (page_issues, total) in zip(queries, first_pages):
+                for start_at in plan_page_ranges(total, self.page_size, len(page_issues)):
+                    page_futures.append(
+                        (
+                            jql,
+                            executor.submit(
+                                self._fetch_page, jql, start_at, validate_query, fields
+                            ),
+                        )
+                    )
+            query_pages = {
+                jql: [page_issues] for jql, (page_issues, _) in zip(queries, first_pages)
+            }
+            for jql, future in page_futures:
+                page_issues, _ = future.result()
+                report_page(page_issues)
+                query_pages[jql].append(page_issues)
+
+        for jql, (_, total) in zip(queries, first_pages):
+            fetched = len({issue["key"] for page in query_pages[jql] for issue in page})
+            if fetched != total:
+                # An issue entered or left the query between pages, which shifts the offsets
+                # of later pages and drops or repeats tickets
+                print(
+                    f"Query results changed while fetching ({fetched} of {total} issues), "
+                    "fetching the query again"
+                )
+                query_pages[jql] = [self._paginate_search(jql, validate_query, fields)]
+
+        all_issues = merge_partitions(page for pages in query_pages.values() for page in pages)
         print(f"Successfully fetched all {len(all_issues)} issues")
         return all_issues
 
+    def fetch_parent_issue_summaries(self, issue_keys: typing.Iterable[str]) -> dict:
+        """
+        Fetch the summaries of several parent issues with batched `key in (...)` queries.
+
+        Summaries already in the cache are not fetched again.
+
+        Returns:
+            Dictionary mapping each parent key to its summary
+        """
+        keys = sorted(set(issue_keys))
+        missing = [key for key in keys if key not in self.parent_summary_cache]
+        for i in range(0, len(missing), KEY_BATCH_SIZE):
+            batch = missing[i : i + KEY_BATCH_SIZE]
+            print(f"Fetching {len(batch)} parent issue summaries")
+            parents = self._search_issues(
+                f"key in ({', '.join(batch)})", validate_query="warn", fields="summary"
+            )
+            for parent in parents:
+                self.parent_summary_cache[parent["key"]] = str(parent["fields"]["summary"])
+        # Parents the search couldn't return fall back to one request each
+        return {key: self.fetch_parent_issue_summary(key) for key in keys}
+
     def fetch_parent_issue_summary(self, issue_key: str) -> str:
         """Fetch the summary of a parent issue from Jira"""
+        if issue_key in self.parent_summary_cache:
+            return self.parent_summary_cache[issue_key]
+
+        summary = self.in_flight.do(
+            self._flight_key("parent", issue_key),
+            lambda: self._request_parent_issue_summary(issue_key),
+        )
+        if not summary.startswith("Error:"):
+            self.parent_summary_cache[issue_key] = summary
+        return summary
+
+    def _request_parent_issue_summary(self, issue_key: str) -> str:
         print(f"Fetching parent issue summary: {issue_key}")
         url = f"{self.jira_base_url}/rest/api/2/issue/{issue_key}"
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+            response = self._get(url)
             data = response.json()
             return str(data["fields"]["summary"])
         except RequestException as e:
@@ -1,21 +1,52 @@
 import argparse
 import os
+import time
 import tkinter as tk
 
 from dotenv import load_dotenv
 
-from config import CLUSTER_K_DIST, CLUSTER_LAYOUT, NODE_K_DIST, NODE_LAYOUT
-from graph_builder import build_blocker_graph
+from batch import run_batch_mode
+from config import (
+    BATCH_WORKERS,
+    CLUSTER_K_DIST,
+    CLUSTER_LAYOUT,
+    EXPAND_DEPTH,
+    EXPAND_MAX_ISSUES,
+    GRAPH_STORE_PATH,
+    LAYOUT_ALGORITHMS,
+    NODE_K_DIST,
+    NODE_LAYOUT,
+    OUTPUT_FORMAT,
+    PERFORMANCE_PROFILES,
+    PROFILE_MODE,
+    SERVER_HOST,
+    SERVER_PORT,
+    TEAM_OPTIONS,
+    WATCH_INTERVAL,
+)
+from graph_builder import build_blocker_graph, expand_blocker_scope
+from graph_store import GraphStore
 from gui import JiraBlockerChainGUI
+from html_export import save_html_graph
 from jira_client import JiraClient
+from server import run_server
+from snapshot import (
+    build_snapshot,
+    diff_snapshots,
+    format_snapshot_diff,
+    load_snapshot,
+    save_snapshot,
+)
 from visualizer import visualize_graph
+from watcher import run_watch_mode
+from webhook import replay_webhooks, run_webhook_server
 
 
-def run_cli_mode(args):
+def run_cli_mode(args, timer=None):
     """Run in command-line mode using environment variables and command-line arguments"""
     dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
     load_dotenv(dotenv_path=dotenv_path)
-    jira_client = JiraClient()
+    jira_client = JiraClient.from_profile(args.profile_mode)
 
     try:
         # Get settings from environment variables
@@ -29,32 +60,242 @@ def run_cli_mode(args):
             "node_layout": args.node_layout,
             "cluster_k": args.cluster_k,
             "node_k": args.node_k,
+            "profile": args.profile_mode,
         }
 
+        if args.watch:
+            # Keep polling and regenerating the saved graph until interrupted
+            run_watch_mode(
+                jira_client,
+                project_key,
+                sprint_codes,
+                team_guid,
+                layout_settings,
+                args.watch_interval,
+                expand_depth=args.expand_depth,
+                expand_limit=args.expand_limit,
+            )
+            return
+
         # Generate the graph
         issues = jira_client.fetch_issues(project_key, sprint_codes, team_guid)
-        graph, issues_in_chains, node_sizes = build_blocker_graph(issues)
-        chain_graph = graph.subgraph(issues_in_chains)
-
-        # Use layout settings in visualization
-        visualize_graph(
-            chain_graph,
-            issues,
-            node_sizes,
+        if args.expand_depth > 0:
+            issues = expand_blocker_scope(
+                issues, jira_client, args.expand_depth, max_issues=args.expand_limit
+            )
+        graph, _, node_sizes = build_blocker_graph(issues)
+
+        position_cache: dict = {}
+        if args.format == "html":
+            # The browser lays the graph out, so there is no layout or rendering to do here
+            save_html_graph(graph, issues, node_sizes, jira_client, sprint_codes)
+        else:
+            # Use layout settings in visualization
+            visualize_graph(
+                graph,
+                issues,
+                node_sizes,
+                jira_client,
+                sprint_codes,
+                save_file=args.save,
+                layout_settings=layout_settings,
+                position_cache=position_cache,
+                before_show=timer.report if timer else None,
+            )
+
+        if args.snapshot:
+            snapshot = build_snapshot(
+                graph,
+                issues,
+                sprint_codes,
+                node_pos=position_cache.get("layout"),
+                parent_names=jira_client.parent_summary_cache,
+            )
+            save_snapshot(snapshot)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+
+def run_batch_cli_mode(args):
+    """Generate a graph for each selected team from a single shared Jira fetch"""
+    dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
+    load_dotenv(dotenv_path=dotenv_path)
+    jira_client = JiraClient.from_profile(args.profile_mode)
+
+    team_names = args.batch_teams or list(TEAM_OPTIONS)
+    unknown_teams = [name for name in team_names if name not in TEAM_OPTIONS]
+    if unknown_teams:
+        print(
+            f"Unknown team(s): {', '.join(unknown_teams)}. Choose from: {', '.join(TEAM_OPTIONS)}"
+        )
+        return
+
+    layout_settings = {
+        "cluster_layout": args.cluster_layout,
+        "node_layout": args.node_layout,
+        "cluster_k": args.cluster_k,
+        "node_k": args.node_k,
+        "profile": args.profile_mode,
+    }
+    try:
+        run_batch_mode(
             jira_client,
-            sprint_codes,
-            save_file=args.save,
-            layout_settings=layout_settings,
+            os.getenv("PROJECT_KEY"),
+            os.getenv("SPRINT"),
+            {name: TEAM_OPTIONS[name] for name in team_names},
+            layout_settings,
+            max_workers=args.workers,
         )
     except Exception as e:
         print(f"An error occurred: {e}")
 
 
+def run_store_mode(args, timer=None):
+    """Load the whole project into the disk-backed graph store and/or query a slice of it"""
+    dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
+    load_dotenv(dotenv_path=dotenv_path)
+    jira_client = JiraClient.from_profile(args.profile_mode)
+    project_key = os.getenv("PROJECT_KEY")
+    store = GraphStore(args.store)
+
+    try:
+        if args.load:
+            count = store.load_project(jira_client, project_key)
+            print(f"Stored {count} issues in {args.store}")
+
+        if args.query == "top-blockers":
+            for key, impact in store.top_blockers(args.limit):
+                print(f"{key}: blocks {impact} tickets")
+            return
+        if args.query in ("chain", "impact") and not args.key:
+            print(f"--key is required for --query {args.query}")
+            return
+
+        if args.query == "chain":
+            slice_keys = store.chain(args.key)
+        elif args.query == "impact":
+            slice_keys = store.chain(args.key, direction="downstream")
+            print(f"{args.key} blocks {len(slice_keys) - 1} tickets")
+        elif args.query == "critical-path":
+            critical_path = store.critical_path()
+            steps = [
+                step[0] if len(step) == 1 else f"cycle ({', '.join(step)})"
+                for step in critical_path
+            ]
+            print(f"Critical path: {' -> '.join(steps)}")
+            slice_keys = {key for step in critical_path for key in step}
+        else:
+            return
+
+        # Only the requested slice is loaded into memory and rendered
+        graph, issues, node_sizes = store.subgraph(slice_keys)
+        parent_keys = {
+            issue["fields"]["parent"]["key"] for issue in issues if "parent" in issue["fields"]
+        }
+        title = f"{project_key} {args.query} {args.key or ''}".strip()
+        parent_names = store.parent_names(jira_client, parent_keys)
+        if args.format == "html":
+            save_html_graph(
+                graph,
+                issues,
+                node_sizes,
+                jira_client,
+                project_key,
+                parent_names=parent_names,
+                title=title,
+            )
+        else:
+            visualize_graph(
+                graph,
+                issues,
+                node_sizes,
+                jira_client,
+                project_key,
+                save_file=args.save,
+                layout_settings={"profile": args.profile_mode},
+                parent_names=parent_names,
+                title=title,
+                before_show=timer.report if timer else None,
+            )
+    except Exception as e:
+        print(f"An error occurred: {e}")
+    finally:
+        store.close()
+
+
+def run_diff_mode(args):
+    """Print the differences between two saved snapshots"""
+    old_path, new_path = args.diff_snapshots
+    try:
+        old = load_snapshot(old_path)
+        new = load_snapshot(new_path)
+        print(format_snapshot_diff(old, new, diff_snapshots(old, new)))
+    except ValueError as e:
+        print(f"An error occurred: {e}")
+
+
+def run_server_mode(args):
+    """Run the HTTP graph service using the Jira credentials from the .env file"""
+    dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
+    load_dotenv(dotenv_path=dotenv_path)
+    defaults = {
+        "project": os.getenv("PROJECT_KEY"),
+        "team": os.getenv("TEAM_GUID"),
+        "sprints": os.getenv("SPRINT"),
+        "profile": args.profile_mode,
+    }
+    run_server(JiraClient.from_profile(args.profile_mode), args.host, args.port, defaults=defaults)
+
+
+def run_webhook_mode(args):
+    """Keep the blocker graph of the .env scope up to date from Jira webhooks"""
+    dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
+    load_dotenv(dotenv_path=dotenv_path)
+    try:
+        run_webhook_server(
+            JiraClient.from_profile(args.profile_mode),
+            os.getenv("PROJECT_KEY"),
+            os.getenv("SPRINT"),
+            os.getenv("TEAM_GUID"),
+            args.host,
+            args.port,
+            secret=os.getenv("WEBHOOK_SECRET"),
+            layout_settings={"profile": args.profile_mode},
+        )
+    except ValueError as e:
+        print(f"An error occurred: {e}")
+
+
+def run_replay_mode(args):
+    """Post recorded webhook payloads to a running webhook receiver"""
+    dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
+    load_dotenv(dotenv_path=dotenv_path)
+    url = f"http://{args.host}:{args.port}/webhook"
+    try:
+        replay_webhooks(args.replay_webhooks, url, secret=os.getenv("WEBHOOK_SECRET"))
+    except (OSError, ValueError) as e:
+        print(f"An error occurred: {e}")
+
+
+# Reports how long a run took, with the performance profile it used
+class RunTimer:
+    """Measures a CLI run and reports it once, before an interactive graph window blocks"""
+
+    def __init__(self, profile_mode: str):
+        self.profile_mode = profile_mode
+        self.started_at = time.perf_counter()
+        self.reported = False
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        elapsed = time.perf_counter() - self.started_at
+        print(f"Run took {elapsed:.2f} seconds ({self.profile_mode} profile)")
+
+
 def main():
     """Main entry point with support for GUI and CLI modes"""
-    # Define available layout algorithms
-    layout_algorithms = ["kamada-kawai", "spring", "fruchterman_reingold", "circular", "planar"]
-
     # Set up argument parser
     parser = argparse.ArgumentParser(description="Jira Blocker Chain Tool")
     parser.add_argument("--cli", action="store_true", help="Run in command-line mode")
@@ -64,16 +305,37 @@ def main():
         help="Save the graph to a file instead of displaying it (CLI mode only)",
     )
 
+    parser.add_argument(
+        "--format",
+        choices=["png", "html"],
+        default=OUTPUT_FORMAT,
+        help=(
+            "Output format in CLI mode. html writes a self-contained interactive page that lays "
+            f"the graph out in the browser and is always saved (default: {OUTPUT_FORMAT})"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile-mode",
+        choices=list(PERFORMANCE_PROFILES),
+        default=PROFILE_MODE,
+        help=(
+            "Performance profile setting layout iterations and convergence, Jira fetch "
+            "concurrency and page size, layout reuse and image resolution "
+            f"(default: {PROFILE_MODE})"
+        ),
+    )
+
     # Layout configuration arguments
     parser.add_argument(
         "--cluster-layout",
-        choices=layout_algorithms,
+        choices=LAYOUT_ALGORITHMS,
         default=CLUSTER_LAYOUT,
         help=f"Layout algorithm for clusters (default: {CLUSTER_LAYOUT})",
     )
     parser.add_argument(
         "--node-layout",
-        choices=layout_algorithms,
+        choices=LAYOUT_ALGORITHMS,
         default=NODE_LAYOUT,
         help=f"Layout algorithm for nodes within clusters (default: {NODE_LAYOUT})",
     )
@@ -90,15 +352,154 @@ def main():
         help=f"K distance parameter for node layout (default: {NODE_K_DIST})",
     )
 
+    # Cross-scope expansion arguments
+    parser.add_argument(
+        "--expand-depth",
+        type=int,
+        default=EXPAND_DEPTH,
+        help=(
+            "Follow blocker links to tickets outside the selected sprints up to this many hops "
+            f"(default: {EXPAND_DEPTH})"
+        ),
+    )
+    parser.add_argument(
+        "--expand-limit",
+        type=int,
+        default=EXPAND_MAX_ISSUES,
+        help=f"Maximum number of extra tickets fetched by expansion (default: {EXPAND_MAX_ISSUES})",
+    )
+
+    # Watch mode arguments
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep polling Jira and save a new graph whenever the blocker graph changes (CLI mode)",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Seconds between polls in watch mode (default: {WATCH_INTERVAL})",
+    )
+
+    # Server mode arguments
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run an HTTP service that serves cached graphs at /graph",
+    )
+    parser.add_argument(
+        "--host",
+        default=SERVER_HOST,
+        help=f"Interface the HTTP service or webhook receiver listens on (default: {SERVER_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=SERVER_PORT,
+        help=f"Port the HTTP service or webhook receiver listens on (default: {SERVER_PORT})",
+    )
+
+    # Webhook arguments
+    parser.add_argument(
+        "--webhook",
+        action="store_true",
+        help="Receive Jira webhooks at /webhook and serve the live graph at /graph",
+    )
+    parser.add_argument(
+        "--replay-webhooks",
+        metavar="FILE",
+        help="Post the recorded webhook payloads in FILE (one JSON per line) to a receiver",
+    )
+
+    # Snapshot arguments
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Save a compressed snapshot of the graph for later comparison (CLI mode only)",
+    )
+    parser.add_argument(
+        "--diff-snapshots",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Compare two saved snapshots and print the changes",
+    )
+
+    # Batch arguments
+    parser.add_argument(
+        "--batch-teams",
+        nargs="*",
+        metavar="TEAM",
+        help=(
+            "Save a graph for each listed team (all teams if none are listed) "
+            "using a single Jira fetch"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BATCH_WORKERS,
+        help=f"Worker processes rendering team graphs in batch mode (default: {BATCH_WORKERS})",
+    )
+
+    # Disk-backed graph store arguments
+    parser.add_argument(
+        "--store",
+        nargs="?",
+        const=GRAPH_STORE_PATH,
+        metavar="PATH",
+        help=(
+            "Use a SQLite graph store for project-wide analysis without sprint or team filters "
+            f"(default path: {GRAPH_STORE_PATH})"
+        ),
+    )
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Stream every open issue of PROJECT_KEY from Jira into the graph store",
+    )
+    parser.add_argument(
+        "--query",
+        choices=["chain", "critical-path", "impact", "top-blockers"],
+        help="Query the graph store, rendering the resulting slice of the graph",
+    )
+    parser.add_argument("--key", help="Ticket key for the chain and impact queries")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Number of tickets listed by the top-blockers query (default: 10)",
+    )
+
     args = parser.parse_args()
 
-    if args.cli:
+    if args.watch:
+        args.cli = True
+
+    timer = RunTimer(args.profile_mode)
+    if args.diff_snapshots:
+        run_diff_mode(args)
+    elif args.store:
+        run_store_mode(args, timer)
+        timer.report()
+    elif args.batch_teams is not None:
+        run_batch_cli_mode(args)
+        timer.report()
+    elif args.replay_webhooks:
+        run_replay_mode(args)
+    elif args.webhook:
+        run_webhook_mode(args)
+    elif args.serve:
+        run_server_mode(args)
+    elif args.cli:
         # Run in CLI mode with command-line arguments
-        run_cli_mode(args)
+        run_cli_mode(args, timer)
+        if not args.watch:
+            timer.report()
     else:
         # Run in GUI mode
         root = tk.Tk()
-        JiraBlockerChainGUI(root)
+        JiraBlockerChainGUI(root, profile_mode=args.profile_mode)
         root.mainloop()
 
 
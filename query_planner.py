@@ -0,0 +1,76 @@
+import re
+import typing
+
+
+# Splits a comma-separated list (sprint codes, project keys, team GUIDs) into its parts
+def split_codes(codes: str) -> list:
+    return [part.strip() for part in codes.split(",") if part.strip()]
+
+
+# Builds "field = X" for a single value and "field in (X, Y)" for several
+def _field_clause(field: str, values: list) -> str:
+    if len(values) == 1:
+        return f"{field} = {values[0]}"
+    return f"{field} in ({', '.join(values)})"
+
+
+def build_scope_jql(project_key: str, sprint_codes: str, team_guid: str) -> str:
+    """
+    Build the JQL for a project/sprint/team scope, ordered by issue key.
+
+    Each argument may be a comma-separated list. The explicit ordering lets the pages of a
+    query be fetched in parallel, as each page covers its own range of keys.
+    """
+    return (
+        f"{_field_clause('project', split_codes(project_key))} AND "
+        f"{_field_clause('sprint', split_codes(sprint_codes))} AND "
+        f"{_field_clause('Team[Team]', split_codes(team_guid))} AND status != DONE "
+        "ORDER BY key ASC"
+    )
+
+
+def plan_scope_queries(project_key: str, sprint_codes: str, team_guid: str) -> list:
+    """
+    Split a scope into independent queries, one per project and sprint.
+
+    Together the queries match the same issues as build_scope_jql. Tickets carried over
+    between sprints match several of them, so results must be merged with merge_partitions.
+    """
+    return [
+        build_scope_jql(project, sprint, team_guid)
+        for project in split_codes(project_key)
+        for sprint in split_codes(sprint_codes)
+    ]
+
+
+def plan_page_ranges(total: int, page_size: int, first_page_size: int) -> list:
+    """
+    List the startAt offsets of the pages still needed after the first page of a query.
+
+    Queries are ordered by key, so each page covers its own range of keys and the pages can
+    be fetched in parallel.
+    """
+    return list(range(first_page_size, total, page_size))
+
+
+# Sorts like Jira's "ORDER BY key": by project key, then by issue number
+def issue_sort_key(issue: dict) -> typing.Tuple[str, int]:
+    match = re.match(r"^(.*)-(\d+)$", issue["key"])
+    if not match:
+        return issue["key"], 0
+    return match.group(1), int(match.group(2))
+
+
+def merge_partitions(partitions: typing.Iterable[list]) -> list:
+    """
+    Merge the results of partitioned queries, dropping duplicates.
+
+    Issues are sorted like JQL's ORDER BY key: by project key, then by issue number.
+    fetch_issues sorts the results of a single query the same way, so the partitioned and
+    single-query paths return the same order even where Jira orders projects differently.
+    """
+    issues_by_key = {}
+    for issues in partitions:
+        for issue in issues:
+            issues_by_key.setdefault(issue["key"], issue)
+    return sorted(issues_by_key.values(), key=issue_sort_key)
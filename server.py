@@ -0,0 +1,268 @@
+import json
+import typing
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import matplotlib.pyplot as plt
+
+from cache import SingleFlight, TTLCache
+from config import (
+    LAYOUT_ALGORITHMS,
+    PERFORMANCE_PROFILES,
+    PROFILE_MODE,
+    SERVER_CACHE_MAX_ENTRIES,
+    SERVER_CACHE_TTL,
+)
+from graph_builder import build_blocker_graph
+from html_export import build_html_data, render_html
+from jira_client import JiraClient
+from visualizer import graph_to_dict, render_graph
+
+# Marks a cache miss, since None is a valid cached artifact (a scope with no blocker chains)
+_MISSING = object()
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+    "html": "text/html; charset=utf-8",
+}
+
+
+class GraphService:
+    """
+    Fetches, builds and renders blocker graphs on behalf of many users.
+
+    Fetched scopes and rendered artifacts are cached with a TTL and a maximum number of
+    entries. Identical requests that arrive at the same time are coalesced, so they share one
+    upstream fetch and one render.
+    """
+
+    def __init__(
+        self,
+        jira_client: JiraClient,
+        ttl=SERVER_CACHE_TTL,
+        max_entries=SERVER_CACHE_MAX_ENTRIES,
+    ):
+        self.jira_client = jira_client
+        self.scope_cache = TTLCache(max_entries, ttl)
+        self.artifact_cache = TTLCache(max_entries, ttl)
+        self.flights = SingleFlight()
+
+    def get_scope(self, project_key: str, team_guid: str, sprint_codes: str) -> tuple:
+        """Return (issues, chain graph, node sizes) for a scope, fetching it if needed"""
+        scope_key = ("scope", project_key, team_guid, sprint_codes)
+        scope = self.scope_cache.get(scope_key)
+        if scope is None:
+            scope = self.flights.do(
+                scope_key,
+                lambda: self._fetch_scope(scope_key, project_key, team_guid, sprint_codes),
+            )
+        return scope
+
+    # Runs inside the flight, so the scope is cached before waiting requests are released and
+    # the flight is gone. The cache is checked again first: a request that missed it just
+    # before the previous flight stored its result would otherwise fetch again
+    def _fetch_scope(
+        self, scope_key: tuple, project_key: str, team_guid: str, sprint_codes: str
+    ) -> tuple:
+        scope = self.scope_cache.get(scope_key)
+        if scope is None:
+            issues = self.jira_client.fetch_issues(project_key, sprint_codes, team_guid)
+            graph, _, node_sizes = build_blocker_graph(issues)
+            scope = (issues, graph, node_sizes)
+            self.scope_cache.set(scope_key, scope)
+        return scope
+
+    def get_artifact(
+        self,
+        project_key: str,
+        team_guid: str,
+        sprint_codes: str,
+        output_format: str,
+        layout_settings: dict,
+    ) -> typing.Optional[bytes]:
+        """
+        Return the rendered graph for a scope in the requested format.
+
+        Returns:
+            The encoded artifact, or None for an image or page of a scope with no blocker chains
+        """
+        artifact_key = (
+            "artifact",
+            project_key,
+            team_guid,
+            sprint_codes,
+            output_format,
+            tuple(sorted(layout_settings.items())),
+        )
+        artifact = self.artifact_cache.get(artifact_key, _MISSING)
+        if artifact is _MISSING:
+            artifact = self.flights.do(
+                artifact_key,
+                lambda: self._render_cached(
+                    artifact_key,
+                    project_key,
+                    team_guid,
+                    sprint_codes,
+                    output_format,
+                    layout_settings,
+                ),
+            )
+        return artifact
+
+    # Like _fetch_scope, caches the artifact inside the flight, checking the cache first
+    def _render_cached(self, artifact_key: tuple, *render_args) -> typing.Optional[bytes]:
+        artifact = self.artifact_cache.get(artifact_key, _MISSING)
+        if artifact is _MISSING:
+            artifact = self._render(*render_args)
+            self.artifact_cache.set(artifact_key, artifact)
+        return artifact
+
+    def _render(
+        self,
+        project_key: str,
+        team_guid: str,
+        sprint_codes: str,
+        output_format: str,
+        layout_settings: dict,
+    ) -> typing.Optional[bytes]:
+        issues, chain_graph, node_sizes = self.get_scope(project_key, team_guid, sprint_codes)
+        if output_format == "json":
+            graph_data = graph_to_dict(
+                chain_graph, issues, node_sizes, self.jira_client, layout_settings
+            )
+            return json.dumps(graph_data).encode()
+        if output_format == "html":
+            if chain_graph.number_of_nodes() == 0:
+                return None
+            html_data = build_html_data(
+                chain_graph, issues, node_sizes, self.jira_client, sprint_codes
+            )
+            return render_html(html_data).encode()
+        return render_graph(
+            chain_graph,
+            issues,
+            node_sizes,
+            self.jira_client,
+            sprint_codes,
+            image_format=output_format,
+            layout_settings=layout_settings,
+        )
+
+
+class GraphRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET /graph?project=&team=&sprints=&format=png|svg|json|html
+
+    Optional parameters: cluster_layout, node_layout, cluster_k, node_k, profile. Missing
+    project, team, sprints and profile fall back to the server defaults (PROJECT_KEY, TEAM_GUID,
+    SPRINT and --profile-mode). The profile only sets the layout and image resolution, fetches
+    use the client created from the server's --profile-mode.
+    """
+
+    service: GraphService
+    defaults: dict = {}
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path == "/health":
+            self._send(200, "text/plain", b"ok")
+            return
+        if url.path != "/graph":
+            self._send_error(404, f"Unknown path: {url.path}")
+            return
+
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        project_key = params.get("project") or self.defaults.get("project")
+        team_guid = params.get("team") or self.defaults.get("team")
+        sprint_codes = params.get("sprints") or self.defaults.get("sprints")
+        output_format = params.get("format", "png")
+
+        if not project_key or not team_guid or not sprint_codes:
+            self._send_error(400, "project, team and sprints are required")
+            return
+        if output_format not in CONTENT_TYPES:
+            self._send_error(400, f"format must be one of: {', '.join(CONTENT_TYPES)}")
+            return
+        try:
+            layout_settings = self._parse_layout_settings(params)
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+        layout_settings.setdefault("profile", self.defaults.get("profile", PROFILE_MODE))
+
+        # Normalize the sprint list so "J07, K07" and "J07,K07" share a cache entry
+        sprint_codes = ",".join(part.strip() for part in sprint_codes.split(",") if part.strip())
+        try:
+            artifact = self.service.get_artifact(
+                project_key, team_guid, sprint_codes, output_format, layout_settings
+            )
+        except ValueError as e:
+            self._send_error(502, str(e))
+            return
+        except Exception as e:
+            print(f"An error occurred serving {self.path}: {e}")
+            self._send_error(500, f"Error generating the graph: {e}")
+            return
+
+        if artifact is None:
+            self._send_error(404, "No blocker chains found in the specified sprints.")
+            return
+        self._send(200, CONTENT_TYPES[output_format], artifact)
+
+    @staticmethod
+    def _parse_layout_settings(params: dict) -> dict:
+        layout_settings: dict = {}
+        for name in ["cluster_layout", "node_layout"]:
+            if name in params:
+                if params[name] not in LAYOUT_ALGORITHMS:
+                    raise ValueError(f"{name} must be one of: {', '.join(LAYOUT_ALGORITHMS)}")
+                layout_settings[name] = params[name]
+        for name in ["cluster_k", "node_k"]:
+            if name in params:
+                try:
+                    layout_settings[name] = float(params[name])
+                except ValueError:
+                    raise ValueError(f"{name} must be a number")
+        if "profile" in params:
+            if params["profile"] not in PERFORMANCE_PROFILES:
+                raise ValueError(f"profile must be one of: {', '.join(PERFORMANCE_PROFILES)}")
+            layout_settings["profile"] = params["profile"]
+        return layout_settings
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send(status, "application/json", json.dumps({"error": message}).encode())
+
+
+def run_server(jira_client: JiraClient, host: str, port: int, defaults=None):
+    """
+    Run the HTTP graph service until interrupted.
+
+    Args:
+        jira_client: JiraClient instance shared by every request
+        host: Interface to listen on
+        port: Port to listen on
+        defaults: Optional dictionary with default "project", "team", "sprints" and "profile"
+            values
+    """
+    # Requests are rendered off the main thread, so use a non-interactive backend
+    plt.switch_backend("Agg")
+
+    GraphRequestHandler.service = GraphService(jira_client)
+    GraphRequestHandler.defaults = defaults or {}
+    httpd = ThreadingHTTPServer((host, port), GraphRequestHandler)
+    print(f"Serving blocker graphs on http://{host}:{port}/graph (Ctrl+C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping server")
+    finally:
+        httpd.server_close()
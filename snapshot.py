@@ -0,0 +1,172 @@
+import datetime
+import gzip
+import json
+import os
+import typing
+
+import networkx as nx
+
+from config import SNAPSHOT_DIR
+from graph_builder import longest_blocker_chain
+
+SNAPSHOT_VERSION = 1
+
+
+# Groups the edges into blocker chains (weakly connected groups of tickets)
+def _find_chains(edges: list) -> list:
+    neighbors: typing.Dict[str, set] = {}
+    for source, target in edges:
+        neighbors.setdefault(source, set()).add(target)
+        neighbors.setdefault(target, set()).add(source)
+
+    chains = []
+    seen: set = set()
+    for start in sorted(neighbors):
+        if start in seen:
+            continue
+        chain = []
+        stack = [start]
+        seen.add(start)
+        while stack:
+            node = stack.pop()
+            chain.append(node)
+            for neighbor in neighbors[node]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        chains.append(sorted(chain))
+    return chains
+
+
+# Counts the tickets on the longest chain of blockers, every ticket of a blocker cycle included
+def _longest_chain_length(edges: list) -> int:
+    return sum(len(step) for step in longest_blocker_chain(edges))
+
+
+def build_snapshot(
+    graph: nx.DiGraph,
+    issues: list,
+    sprint_codes: str,
+    node_pos=None,
+    parent_names=None,
+) -> dict:
+    """
+    Build a compact snapshot of a blocker graph.
+
+    Args:
+        graph: NetworkX DiGraph of blocker relationships
+        issues: List of Jira issues the graph was built from
+        sprint_codes: Sprint code(s) as a string (comma-separated if multiple)
+        node_pos: Optional dictionary of computed node positions
+        parent_names: Optional dictionary of parent issue summaries
+
+    Returns:
+        JSON-serializable snapshot dictionary
+    """
+    records = {}
+    for issue in issues:
+        fields = issue["fields"]
+        records[issue["key"]] = {
+            "parent": (fields.get("parent") or {}).get("key"),
+            "status": (fields.get("status") or {}).get("name"),
+            "summary": fields.get("summary"),
+        }
+    edges = sorted([source, target] for source, target in graph.edges())
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "sprints": sprint_codes,
+        "issues": records,
+        "edges": edges,
+        "parents": dict(parent_names or {}),
+        "positions": {
+            node: [round(float(x), 4), round(float(y), 4)]
+            for node, (x, y) in (node_pos or {}).items()
+        },
+        # Chains are stored so diffs between old snapshots don't recompute them
+        "chains": _find_chains(edges),
+        "longest_chain": _longest_chain_length(edges),
+    }
+
+
+def save_snapshot(snapshot: dict, directory=SNAPSHOT_DIR) -> str:
+    """Write a snapshot as gzip-compressed JSON and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    sprint_filename = snapshot["sprints"].replace(",", "_").replace(" ", "")
+    path = os.path.join(directory, f"snapshot_{sprint_filename}_{timestamp}.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    print(f"Snapshot saved to: {path}")
+    return path
+
+
+def load_snapshot(path: str) -> dict:
+    """Read a snapshot written by save_snapshot"""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Error reading snapshot {path}: {e}")
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version in {path}: {snapshot.get('version')}")
+    return snapshot
+
+
+def diff_snapshots(old: dict, new: dict) -> dict:
+    """
+    Compare two snapshots.
+
+    Returns:
+        Dictionary with:
+            - added_blockers / removed_blockers: [blocker, blocked] pairs
+            - resolved_chains: chains of the old snapshot with none of their blockers left
+            - new_chains: chains of the new snapshot with none of their blockers in the old one
+            - longest_chain: (old length, new length, growth)
+    """
+    old_edges = {tuple(edge) for edge in old["edges"]}
+    new_edges = {tuple(edge) for edge in new["edges"]}
+    # Counted from the edges rather than read from the snapshots, so lengths stored by older
+    # versions (which skipped tickets in and after blocker cycles) are not compared
+    old_length = _longest_chain_length(old["edges"])
+    new_length = _longest_chain_length(new["edges"])
+
+    def chains_without_edges(chains: list, edges: set, other_edges: set) -> list:
+        # Index the edges by source ticket so each chain only looks at its own edges
+        edges_by_source: typing.Dict[str, list] = {}
+        for edge in edges:
+            edges_by_source.setdefault(edge[0], []).append(edge)
+        return [
+            chain
+            for chain in chains
+            if not any(
+                edge in other_edges for node in chain for edge in edges_by_source.get(node, [])
+            )
+        ]
+
+    return {
+        "added_blockers": sorted(list(edge) for edge in new_edges - old_edges),
+        "removed_blockers": sorted(list(edge) for edge in old_edges - new_edges),
+        "resolved_chains": chains_without_edges(old["chains"], old_edges, new_edges),
+        "new_chains": chains_without_edges(new["chains"], new_edges, old_edges),
+        "longest_chain": (old_length, new_length, new_length - old_length),
+    }
+
+
+def format_snapshot_diff(old: dict, new: dict, diff: dict) -> str:
+    """Format the result of diff_snapshots for printing"""
+    old_length, new_length, growth = diff["longest_chain"]
+    lines = [
+        f"Comparing {old['sprints']} ({old['created']}) with {new['sprints']} ({new['created']})",
+        f"Longest chain: {old_length} -> {new_length} tickets ({growth:+d})",
+        f"Added blockers ({len(diff['added_blockers'])}):",
+    ]
+    lines += [f"  {blocker} blocks {blocked}" for blocker, blocked in diff["added_blockers"]]
+    lines.append(f"Removed blockers ({len(diff['removed_blockers'])}):")
+    lines += [f"  {blocker} blocks {blocked}" for blocker, blocked in diff["removed_blockers"]]
+    lines.append(f"Resolved chains ({len(diff['resolved_chains'])}):")
+    lines += [f"  {', '.join(chain)}" for chain in diff["resolved_chains"]]
+    lines.append(f"New chains ({len(diff['new_chains'])}):")
+    lines += [f"  {', '.join(chain)}" for chain in diff["new_chains"]]
+    return "\n".join(lines)
@@ -0,0 +1,127 @@
+"""
+Regenerate the recorded webhook fixtures used by tests/test_webhook.py.
+
+Simulates a Jira scope and a random sequence of webhook events, and writes the seed issues,
+the payloads (one per line, as replayed by --replay-webhooks) and the issues a fresh fetch
+would return after the last event.
+"""
+
+import copy
+import json
+import os
+import random
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+ISSUE_COUNT = 60
+EVENT_COUNT = 200
+PARENTS = ["ENG-900", "ENG-901", "ENG-902", None]
+
+
+# Builds a "Blocks" link as Jira returns it on the blocking issue
+def _blocks_link(link_id: int, blocked_key: str) -> dict:
+    return {"id": str(link_id), "type": {"name": "Blocks"}, "outwardIssue": {"key": blocked_key}}
+
+
+def main():
+    rng = random.Random(40)
+    issues = {}
+    for number in range(1, ISSUE_COUNT + 1):
+        parent = rng.choice(PARENTS)
+        fields: dict = {"status": {"name": "To Do"}, "summary": f"Ticket {number}"}
+        if parent:
+            fields["parent"] = {"key": parent}
+        fields["issuelinks"] = []
+        issues[f"ENG-{number}"] = {
+            "id": str(10000 + number),
+            "key": f"ENG-{number}",
+            "fields": fields,
+        }
+
+    link_id = 0
+    keys = sorted(issues)
+    for key in keys:
+        for blocked_key in rng.sample(keys, 2):
+            if blocked_key != key and rng.random() < 0.5:
+                link_id += 1
+                issues[key]["fields"]["issuelinks"].append(_blocks_link(link_id, blocked_key))
+    seed = copy.deepcopy(sorted(issues.values(), key=lambda issue: int(issue["id"])))
+
+    payloads = []
+    while len(payloads) < EVENT_COUNT:
+        key = rng.choice(sorted(issues))
+        issue = issues[key]
+        kind = rng.choices(
+            ["status", "parent", "links", "link_created", "link_deleted", "delete"],
+            weights=[4, 2, 4, 4, 4, 1],
+        )[0]
+        if kind == "status":
+            status = "Done" if issue["fields"]["status"]["name"] != "Done" else "In Progress"
+            issue["fields"]["status"] = {"name": status}
+        elif kind == "parent":
+            parent = rng.choice(PARENTS)
+            issue["fields"].pop("parent", None)
+            if parent:
+                issue["fields"]["parent"] = {"key": parent}
+        elif kind == "links":
+            link_id += 1
+            blocked_key = rng.choice(sorted(issues))
+            issue["fields"]["issuelinks"] = [
+                link for link in issue["fields"]["issuelinks"] if rng.random() < 0.5
+            ]
+            if blocked_key != key:
+                issue["fields"]["issuelinks"].append(_blocks_link(link_id, blocked_key))
+        elif kind in ("link_created", "link_deleted"):
+            linked = [link["outwardIssue"]["key"] for link in issue["fields"]["issuelinks"]]
+            if kind == "link_created":
+                blocked_key = rng.choice(sorted(issues))
+                if blocked_key == key or blocked_key in linked:
+                    continue
+                link_id += 1
+                issue["fields"]["issuelinks"].append(_blocks_link(link_id, blocked_key))
+            else:
+                if not linked:
+                    continue
+                blocked_key = rng.choice(linked)
+                issue["fields"]["issuelinks"] = [
+                    link
+                    for link in issue["fields"]["issuelinks"]
+                    if link["outwardIssue"]["key"] != blocked_key
+                ]
+            payloads.append(
+                {
+                    "webhookEvent": f"issuelink_{kind.split('_')[1]}",
+                    "issueLink": {
+                        "id": link_id,
+                        "sourceIssueId": int(issue["id"]),
+                        "destinationIssueId": int(issues[blocked_key]["id"]),
+                        "issueLinkType": {"name": "Blocks"},
+                    },
+                }
+            )
+            continue
+        else:
+            del issues[key]
+            for other in issues.values():
+                other["fields"]["issuelinks"] = [
+                    link
+                    for link in other["fields"]["issuelinks"]
+                    if link["outwardIssue"]["key"] != key
+                ]
+            payloads.append({"webhookEvent": "jira:issue_deleted", "issue": {"key": key}})
+            continue
+        payloads.append({"webhookEvent": "jira:issue_updated", "issue": copy.deepcopy(issue)})
+
+    # A fresh fetch only returns the tickets that are still open
+    final = [issue for issue in issues.values() if issue["fields"]["status"]["name"] != "Done"]
+
+    with open(os.path.join(FIXTURE_DIR, "webhook_seed.json"), "w", encoding="utf-8") as f:
+        json.dump(seed, f, indent=1)
+    with open(os.path.join(FIXTURE_DIR, "webhook_payloads.jsonl"), "w", encoding="utf-8") as f:
+        for payload in payloads:
+            f.write(json.dumps(payload) + "\n")
+    with open(os.path.join(FIXTURE_DIR, "webhook_final.json"), "w", encoding="utf-8") as f:
+        json.dump(final, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
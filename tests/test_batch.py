@@ -0,0 +1,34 @@
+import unittest
+
+from batch import partition_issues_by_team
+from config import TEAM_FIELD
+
+TEAMS = {"Platform": "guid-platform", "Payments": "guid-payments", "Mobile": "guid-mobile"}
+
+
+# Builds an issue whose Team field holds team (an object on Jira Cloud, a plain id elsewhere)
+def _issue(key: str, team) -> dict:
+    return {"key": key, "fields": {TEAM_FIELD: team}}
+
+
+class PartitionIssuesByTeamTest(unittest.TestCase):
+    def test_splits_issues_by_team_guid(self):
+        issues = [
+            _issue("ENG-1", {"id": "guid-platform", "name": "Platform"}),
+            _issue("ENG-2", "guid-payments"),
+            _issue("ENG-3", {"id": "guid-platform"}),
+            _issue("ENG-4", "guid-unknown"),
+            _issue("ENG-5", None),
+        ]
+        partitions = partition_issues_by_team(issues, TEAMS)
+        self.assertEqual(
+            {
+                team: [issue["key"] for issue in team_issues]
+                for team, team_issues in partitions.items()
+            },
+            {"Platform": ["ENG-1", "ENG-3"], "Payments": ["ENG-2"], "Mobile": []},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
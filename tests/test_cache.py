@@ -0,0 +1,140 @@
+import contextlib
+import io
+import threading
+import time
+import unittest
+from unittest import mock
+
+from cache import SingleFlight, TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_entries_expire_after_the_ttl(self):
+        cache = TTLCache(max_entries=10, ttl=60)
+        with mock.patch("cache.time.monotonic", return_value=1000.0):
+            cache.set("key", "value")
+        with mock.patch("cache.time.monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("key"), "value")
+        with mock.patch("cache.time.monotonic", return_value=1061.0):
+            self.assertIsNone(cache.get("key"))
+            self.assertEqual(cache.get("key", "default"), "default")
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+    def test_none_can_be_cached(self):
+        cache = TTLCache(max_entries=2, ttl=60)
+        missing = object()
+        cache.set("key", None)
+        self.assertIsNone(cache.get("key", missing))
+        cache.clear()
+        self.assertIs(cache.get("key", missing), missing)
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_call(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        calls: list = []
+
+        def fetch():
+            calls.append(1)
+            release.wait()
+            return ["issue"]
+
+        results: list = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flights.do("key", fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        # Let every thread reach the flight before the call finishes
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["issue"]] * 5)
+        # The flight is gone once it finished, so a later call runs again
+        flights.do("key", fetch)
+        self.assertEqual(len(calls), 2)
+
+    def test_errors_are_raised_and_the_flight_is_dropped(self):
+        flights = SingleFlight()
+
+        def fetch():
+            raise ValueError("fetch failed")
+
+        with self.assertRaisesRegex(ValueError, "fetch failed"):
+            flights.do("key", fetch)
+        # The failed flight is not kept
+        self.assertEqual(flights.do("key", lambda: "retried"), "retried")
+
+
+class SingleFlightProgressTest(unittest.TestCase):
+    def test_waiting_callers_receive_progress(self):
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        leader_progress: list = []
+        follower_progress: list = []
+
+        def fetch():
+            flights.notify("key", 1, 3)
+            started.set()
+            release.wait()
+            flights.notify("key", 3, 3)
+            return "result"
+
+        leader = threading.Thread(
+            target=flights.do,
+            args=("key", fetch),
+            kwargs={"listener": lambda *progress: leader_progress.append(progress)},
+        )
+        leader.start()
+        started.wait()
+        results = []
+        follower = threading.Thread(
+            target=lambda: results.append(
+                flights.do(
+                    "key", fetch, listener=lambda *progress: follower_progress.append(progress)
+                )
+            )
+        )
+        follower.start()
+        # Wait until the follower joined the flight before letting the fetch finish
+        while not follower_progress:
+            time.sleep(0.01)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(results, ["result"])
+        self.assertEqual(leader_progress, [(1, 3), (3, 3)])
+        self.assertEqual(follower_progress, [(1, 3), (3, 3)])
+
+    def test_listener_errors_do_not_abort_the_call(self):
+        flights = SingleFlight()
+
+        def failing_listener(fetched, total):
+            raise RuntimeError("listener failed")
+
+        def fetch():
+            flights.notify("key", 1, 1)
+            return "result"
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            result = flights.do("key", fetch, listener=failing_listener)
+        self.assertEqual(result, "result")
+        self.assertIn("listener failed", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import random
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from cluster_arrays import (
+    ClusterArrays,
+    _kamada_kawai_cost,
+    circular_positions,
+    cluster_extents,
+    force_directed_positions,
+    kamada_kawai_positions,
+    rescale_positions,
+)
+
+
+# Builds a random blocker graph of one cluster, without isolated tickets
+def _random_cluster(count: int, links: int, seed: int) -> nx.DiGraph:
+    rng = random.Random(seed)
+    keys = [f"ENG-{i}" for i in range(count)]
+    graph = nx.DiGraph()
+    graph.add_nodes_from(keys)
+    for _ in range(links):
+        graph.add_edge(*rng.sample(keys, 2))
+    graph.remove_nodes_from([key for key in keys if graph.degree(key) == 0])
+    return graph
+
+
+class ClusterArraysTest(unittest.TestCase):
+    def test_keeps_links_inside_clusters_both_ways(self):
+        graph = nx.DiGraph([("A", "B"), ("B", "C"), ("C", "A2"), ("A2", "B2")])
+        arrays = ClusterArrays(graph, {"EP-1": ["A", "B", "C"], "EP-2": ["A2", "B2"]})
+
+        self.assertEqual(arrays.offsets.tolist(), [0, 3, 5])
+        self.assertEqual(arrays.cluster_nodes(1), ["A2", "B2"])
+        indptr, indices = arrays.cluster_adjacency(0)
+        neighbors = [sorted(indices[indptr[i] : indptr[i + 1]].tolist()) for i in range(3)]
+        # C -> A2 links two clusters, so it is left out
+        self.assertEqual(neighbors, [[1], [0, 2], [1]])
+        # Only the blocker's side of each link is marked
+        self.assertEqual(arrays.cluster_blocks(0).tolist(), [True, False, True, False])
+        self.assertEqual(arrays.cluster_blocks(1).tolist(), [True, False])
+
+
+class LayoutsMatchNetworkxTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = _random_cluster(40, 55, seed=3)
+        self.nodes = list(self.graph)
+        self.arrays = ClusterArrays(self.graph, {"EP-1": self.nodes})
+        self.indptr, self.indices = self.arrays.cluster_adjacency(0)
+        self.blocks = self.arrays.cluster_blocks(0)
+
+    def _as_array(self, pos: dict) -> np.ndarray:
+        return np.array([pos[node] for node in self.nodes])
+
+    def test_circular(self):
+        expected = self._as_array(nx.circular_layout(self.graph))
+        # networkx computes the angles in float32
+        np.testing.assert_allclose(circular_positions(len(self.nodes)), expected, atol=1e-6)
+
+    def test_spring(self):
+        initial = np.random.default_rng(1).random((len(self.nodes), 2))
+        expected = nx.spring_layout(
+            self.graph,
+            k=0.3,
+            iterations=10,
+            threshold=0,
+            pos=dict(zip(self.nodes, initial)),
+        )
+        positions = force_directed_positions(
+            self.indptr, self.indices, 0.3, 10, 0, initial=initial, blocks=self.blocks
+        )
+        np.testing.assert_allclose(
+            positions, rescale_positions(self._as_array(expected)), atol=1e-10
+        )
+
+    def test_spring_is_repeatable_with_a_seed(self):
+        first, second = (
+            force_directed_positions(self.indptr, self.indices, 0.3, 50, 1e-4, seed=7)
+            for _ in range(2)
+        )
+        np.testing.assert_array_equal(first, second)
+
+    def test_kamada_kawai_cost_and_gradient(self):
+        distance = dict(nx.shortest_path_length(self.graph))
+        count = len(self.nodes)
+        distances = np.full((count, count), 1e6)
+        for i, source in enumerate(self.nodes):
+            for j, target in enumerate(self.nodes):
+                distances[i, j] = distance[source].get(target, 1e6)
+        inverse_distance = 1 / (distances + np.eye(count) * 1e-3)
+        flat_pos = np.random.default_rng(2).random(count * 2)
+
+        expected_cost, expected_gradient = nx.drawing.layout._kamada_kawai_costfn(
+            flat_pos, np, inverse_distance, 1e-3, 2
+        )
+        cost, gradient = _kamada_kawai_cost(flat_pos, inverse_distance.copy(), 1e-3)
+        self.assertAlmostEqual(cost, expected_cost, delta=expected_cost * 1e-12)
+        np.testing.assert_allclose(gradient, expected_gradient, atol=1e-9)
+
+    def test_kamada_kawai(self):
+        expected = self._as_array(nx.kamada_kawai_layout(self.graph))
+        positions = kamada_kawai_positions(self.indptr, self.indices, blocks=self.blocks)
+        # Same optimizer and start, so only rounding differences remain
+        np.testing.assert_allclose(positions, expected, atol=1e-2)
+
+    def test_cluster_extents(self):
+        pos = np.array([[0.5, 0], [0, -2], [3, 4], [1, 0]])
+        np.testing.assert_allclose(cluster_extents(pos, np.array([0, 2, 4])), [2, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import contextlib
+import io
+import unittest
+
+from graph_builder import build_blocker_graph, chained_issue_keys, expand_blocker_scope
+
+
+# Builds an issue with "Blocks" links: blocks lists the tickets it blocks, blocked_by the ones
+# blocking it, and done the linked tickets shown as DONE
+def _issue(key: str, blocks=(), blocked_by=(), done=()) -> dict:
+    def linked(linked_key):
+        status = "Done" if linked_key in done else "To Do"
+        return {"key": linked_key, "fields": {"status": {"name": status}}}
+
+    links = [{"type": {"name": "Blocks"}, "outwardIssue": linked(key)} for key in blocks]
+    links += [{"type": {"name": "Blocks"}, "inwardIssue": linked(key)} for key in blocked_by]
+    links.append({"type": {"name": "Relates"}, "outwardIssue": linked("REL-1")})
+    return {"key": key, "fields": {"issuelinks": links}}
+
+
+# Stands in for JiraClient: serves issues by key and records each batched query
+class KeyedJiraClient:
+    def __init__(self, issues: list):
+        self.issues = {issue["key"]: issue for issue in issues}
+        self.queries: list = []
+
+    def fetch_issues_by_keys(self, issue_keys, fields=None):
+        keys = sorted(issue_keys)
+        self.queries.append((keys, fields))
+        return [self.issues[key] for key in keys if key in self.issues]
+
+
+# ENG-1 is in scope; OUT-1..OUT-4 are one to three hops away
+SCOPE = [_issue("ENG-1", blocks=["OUT-1", "OUT-DONE"], blocked_by=["OUT-2"], done=["OUT-DONE"])]
+OUTSIDE = [
+    _issue("OUT-1", blocks=["OUT-3"], blocked_by=["ENG-1"]),
+    _issue("OUT-2", blocks=["ENG-1"]),
+    _issue("OUT-3", blocks=["OUT-4"], blocked_by=["OUT-1"]),
+    _issue("OUT-4", blocked_by=["OUT-3"]),
+]
+
+
+def _expand(max_depth: int, **kwargs) -> tuple:
+    jira_client = KeyedJiraClient(OUTSIDE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        expanded = expand_blocker_scope(SCOPE, jira_client, max_depth, **kwargs)
+    return [issue["key"] for issue in expanded], jira_client.queries
+
+
+class ExpandBlockerScopeTest(unittest.TestCase):
+    def test_follows_links_both_ways_one_query_per_level(self):
+        keys, queries = _expand(3, fields="issuelinks")
+        self.assertEqual(keys, ["ENG-1", "OUT-1", "OUT-2", "OUT-3", "OUT-4"])
+        self.assertEqual(
+            queries,
+            [
+                (["OUT-1", "OUT-2"], "issuelinks"),
+                (["OUT-3"], "issuelinks"),
+                (["OUT-4"], "issuelinks"),
+            ],
+        )
+
+    def test_stops_at_max_depth(self):
+        keys, queries = _expand(1)
+        self.assertEqual(keys, ["ENG-1", "OUT-1", "OUT-2"])
+        self.assertEqual(len(queries), 1)
+
+    def test_stops_at_max_issues(self):
+        keys, _ = _expand(3, max_issues=1)
+        self.assertEqual(keys, ["ENG-1", "OUT-1"])
+
+    def test_skips_done_and_non_blocker_links(self):
+        _, queries = _expand(3)
+        fetched = {key for keys, _ in queries for key in keys}
+        self.assertNotIn("OUT-DONE", fetched)
+        self.assertNotIn("REL-1", fetched)
+
+    def test_null_issue_links_are_skipped(self):
+        jira_client = KeyedJiraClient([{"key": "OUT-1", "fields": {"issuelinks": None}}])
+        with contextlib.redirect_stdout(io.StringIO()):
+            expanded = expand_blocker_scope(
+                [_issue("ENG-1", blocks=["OUT-1"])], jira_client, max_depth=3
+            )
+        self.assertEqual([issue["key"] for issue in expanded], ["ENG-1", "OUT-1"])
+
+    def test_expanded_graph_links_the_new_tickets(self):
+        jira_client = KeyedJiraClient(OUTSIDE)
+        with contextlib.redirect_stdout(io.StringIO()):
+            expanded = expand_blocker_scope(SCOPE, jira_client, 3)
+        graph, issues_in_chains, _ = build_blocker_graph(expanded)
+        self.assertEqual(issues_in_chains, chained_issue_keys(expanded))
+        self.assertTrue(graph.has_edge("OUT-3", "OUT-4"))
+        self.assertTrue(graph.has_edge("ENG-1", "OUT-1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from graph_builder import build_blocker_graph
+from graph_store import GraphStore
+
+
+# Builds an issue with "Blocks" links to the given keys
+def _issue(key: str, blocks=(), parent=None) -> dict:
+    fields: dict = {
+        "issuelinks": [
+            {"type": {"name": "Blocks"}, "outwardIssue": {"key": blocked}} for blocked in blocks
+        ],
+        "status": {"name": "To Do"},
+        "summary": f"Summary of {key}",
+    }
+    if parent:
+        fields["parent"] = {"key": parent}
+    return {"key": key, "fields": fields}
+
+
+# ENG-1 -> ENG-2 <-> ENG-3 -> ENG-4 is the longest chain, with ENG-2 and ENG-3 blocking each
+# other. OTHER-1 is not stored, so ENG-5 only blocks ENG-6
+ISSUES = [
+    _issue("ENG-1", ["ENG-2"], parent="EP-1"),
+    _issue("ENG-2", ["ENG-3"], parent="EP-1"),
+    _issue("ENG-3", ["ENG-2", "ENG-4"], parent="EP-1"),
+    _issue("ENG-4", parent="EP-2"),
+    _issue("ENG-5", ["ENG-6", "OTHER-1"]),
+    _issue("ENG-6"),
+]
+
+
+# Stands in for JiraClient: serves the issues in pages of two
+class PagedJiraClient:
+    def __init__(self, issues: list):
+        self.issues = issues
+        self.parent_fetches: list = []
+
+    def iter_issue_pages(self, jql, validate_query="strict", fields=None):
+        for start in range(0, len(self.issues), 2):
+            yield self.issues[start : start + 2], len(self.issues)
+
+    def fetch_parent_issue_summaries(self, parent_keys):
+        self.parent_fetches.append(sorted(parent_keys))
+        return {key: f"Summary of {key}" for key in parent_keys}
+
+
+class GraphStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "graph.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            store = GraphStore(self.path)
+            store.load_project(PagedJiraClient(ISSUES), "ENG")
+            store.close()
+
+    def _open(self) -> GraphStore:
+        store = GraphStore(self.path)
+        self.addCleanup(store.close)
+        return store
+
+    def test_chain_follows_links_in_each_direction(self):
+        store = self._open()
+        self.assertEqual(store.chain("ENG-2"), {"ENG-1", "ENG-2", "ENG-3", "ENG-4"})
+        self.assertEqual(store.chain("ENG-3", direction="downstream"), {"ENG-2", "ENG-3", "ENG-4"})
+        self.assertEqual(store.chain("ENG-3", direction="upstream"), {"ENG-1", "ENG-2", "ENG-3"})
+        self.assertEqual(store.chain("ENG-5"), {"ENG-5", "ENG-6"})
+
+    def test_impact_and_top_blockers(self):
+        store = self._open()
+        self.assertEqual(store.impact("ENG-1"), 3)
+        self.assertEqual(store.impact("ENG-5"), 1)
+        self.assertEqual(store.impact("ENG-4"), 0)
+        self.assertEqual(store.top_blockers(3), [("ENG-1", 3), ("ENG-2", 2), ("ENG-3", 2)])
+
+    def test_subgraph_matches_build_blocker_graph(self):
+        store = self._open()
+        graph, issues, node_sizes = store.subgraph(["ENG-1", "ENG-2", "ENG-3"])
+        expected_graph, _, expected_sizes = build_blocker_graph(ISSUES[:3])
+        self.assertEqual(set(graph.edges()), set(expected_graph.edges()))
+        self.assertEqual(node_sizes, expected_sizes)
+        self.assertEqual(
+            {issue["key"]: issue["fields"]["parent"]["key"] for issue in issues},
+            {"ENG-1": "EP-1", "ENG-2": "EP-1", "ENG-3": "EP-1"},
+        )
+
+    def test_parent_names_are_fetched_once(self):
+        store = self._open()
+        jira_client = PagedJiraClient(ISSUES)
+        for _ in range(2):
+            self.assertEqual(
+                store.parent_names(jira_client, ["EP-1", "EP-2"]),
+                {"EP-1": "Summary of EP-1", "EP-2": "Summary of EP-2"},
+            )
+        self.assertEqual(jira_client.parent_fetches, [["EP-1", "EP-2"]])
+
+    def test_critical_path_condenses_cycle(self):
+        store = GraphStore(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual(store.critical_path(), [["ENG-1"], ["ENG-2", "ENG-3"], ["ENG-4"]])
+
+    def test_store_mode_prints_and_renders_cycle(self):
+        args = argparse.Namespace(
+            store=self.path,
+            load=False,
+            query="critical-path",
+            key=None,
+            limit=10,
+            format="png",
+            save=True,
+            profile_mode="balanced",
+        )
+        output = io.StringIO()
+        with mock.patch.object(main, "JiraClient") as jira_client, mock.patch.object(
+            main, "visualize_graph"
+        ) as visualize_graph, contextlib.redirect_stdout(output):
+            jira_client.from_profile.return_value = PagedJiraClient(ISSUES)
+            main.run_store_mode(args)
+
+        self.assertIn("Critical path: ENG-1 -> cycle (ENG-2, ENG-3) -> ENG-4", output.getvalue())
+        graph = visualize_graph.call_args.args[0]
+        self.assertEqual(set(graph.nodes()), {"ENG-1", "ENG-2", "ENG-3", "ENG-4"})
+        self.assertIn(("ENG-3", "ENG-2"), graph.edges())
+        self.assertEqual(
+            visualize_graph.call_args.kwargs["parent_names"],
+            {"EP-1": "Summary of EP-1", "EP-2": "Summary of EP-2"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
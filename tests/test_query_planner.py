@@ -0,0 +1,55 @@
+import unittest
+
+from query_planner import build_scope_jql, merge_partitions, plan_page_ranges, plan_scope_queries
+
+
+class PlanScopeQueriesTest(unittest.TestCase):
+    def test_one_query_per_project_and_sprint(self):
+        queries = plan_scope_queries("ENG, OPS", "J07,K07", "team-a,team-b")
+        self.assertEqual(
+            queries,
+            [
+                build_scope_jql("ENG", "J07", "team-a,team-b"),
+                build_scope_jql("ENG", "K07", "team-a,team-b"),
+                build_scope_jql("OPS", "J07", "team-a,team-b"),
+                build_scope_jql("OPS", "K07", "team-a,team-b"),
+            ],
+        )
+        self.assertEqual(
+            queries[0],
+            "project = ENG AND sprint = J07 AND Team[Team] in (team-a, team-b) AND "
+            "status != DONE ORDER BY key ASC",
+        )
+
+    def test_single_scope_is_one_query(self):
+        self.assertEqual(
+            plan_scope_queries("ENG", "J07", "team"), [build_scope_jql("ENG", "J07", "team")]
+        )
+
+    def test_page_ranges_follow_the_first_page(self):
+        self.assertEqual(plan_page_ranges(250, 100, 100), [100, 200])
+        # Jira may return fewer issues per page than requested
+        self.assertEqual(plan_page_ranges(120, 100, 50), [50])
+        self.assertEqual(plan_page_ranges(40, 100, 40), [])
+
+
+class MergePartitionsTest(unittest.TestCase):
+    def test_drops_duplicates_and_sorts_like_order_by_key(self):
+        j07 = [{"key": "OPS-2", "fields": {"sprint": "J07"}}, {"key": "ENG-10", "fields": {}}]
+        k07 = [
+            {"key": "ENG-9", "fields": {}},
+            {"key": "ENG-10", "fields": {}},
+            {"key": "OPS-2", "fields": {"sprint": "K07"}},
+        ]
+        merged = merge_partitions([j07, k07])
+        self.assertEqual([issue["key"] for issue in merged], ["ENG-9", "ENG-10", "OPS-2"])
+        # The first partition's copy of a carried-over ticket is kept
+        self.assertEqual(merged[2]["fields"], {"sprint": "J07"})
+
+    def test_order_does_not_depend_on_the_partitions(self):
+        issues = [{"key": key, "fields": {}} for key in ["OPS-1", "ENG-2", "ENG-11", "ABC-7"]]
+        self.assertEqual(merge_partitions([issues]), merge_partitions([issues[2:], issues[:2]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+import unittest
+
+import requests
+
+from server import GraphRequestHandler, GraphService, run_server
+from tests.test_webhook import _free_port
+
+
+# Stands in for JiraClient: counts fetches, each taking long enough for requests to overlap
+class SlowJiraClient:
+    def __init__(self):
+        self.fetches = 0
+        self.lock = threading.Lock()
+
+    def fetch_issues(self, project_key, sprint_codes, team_guid):
+        with self.lock:
+            self.fetches += 1
+        time.sleep(0.2)
+        return [
+            {
+                "key": "ENG-1",
+                "fields": {
+                    "issuelinks": [{"type": {"name": "Blocks"}, "outwardIssue": {"key": "ENG-2"}}],
+                    "parent": {"key": "EP-1"},
+                },
+            },
+            {"key": "ENG-2", "fields": {"issuelinks": [], "parent": {"key": "EP-1"}}},
+        ]
+
+    def fetch_parent_issue_summary(self, parent_key):
+        return f"Summary of {parent_key}"
+
+
+class GraphServiceTest(unittest.TestCase):
+    def test_identical_requests_share_one_fetch(self):
+        jira_client = SlowJiraClient()
+        service = GraphService(jira_client)
+        results = []
+
+        def request():
+            results.append(service.get_artifact("ENG", "team", "J07", "json", {}))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Requests after the flight are served from the cache
+        results.append(service.get_artifact("ENG", "team", "J07", "json", {}))
+
+        self.assertEqual(jira_client.fetches, 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(
+            {node["key"] for node in json.loads(results[0])["nodes"]}, {"ENG-1", "ENG-2"}
+        )
+
+
+# Fails every render with an error that is not a ValueError
+class FailingGraphService(GraphService):
+    def _render(self, *render_args):
+        raise RuntimeError("render failed")
+
+
+class GraphRequestHandlerTest(unittest.TestCase):
+    def test_unexpected_error_is_answered_with_500(self):
+        port = _free_port()
+        threading.Thread(
+            target=run_server, args=(SlowJiraClient(), "127.0.0.1", port), daemon=True
+        ).start()
+        base_url = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            try:
+                requests.get(f"{base_url}/health", timeout=1)
+                break
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.05)
+        GraphRequestHandler.service = FailingGraphService(SlowJiraClient())
+
+        response = requests.get(f"{base_url}/graph?project=ENG&team=team&sprints=J07")
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("render failed", response.json()["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import networkx as nx
+
+from snapshot import build_snapshot, diff_snapshots
+
+
+# Builds a snapshot of the graph with the given (blocker, blocked) links
+def _snapshot(edges: list) -> dict:
+    graph = nx.DiGraph(edges)
+    issues = [{"key": key, "fields": {}} for key in sorted(graph.nodes())]
+    return build_snapshot(graph, issues, "J07")
+
+
+class LongestChainTest(unittest.TestCase):
+    def test_counts_every_ticket_of_a_blocker_cycle(self):
+        # ENG-2 and ENG-3 block each other, and ENG-4 is only reachable through them
+        snapshot = _snapshot(
+            [("ENG-1", "ENG-2"), ("ENG-2", "ENG-3"), ("ENG-3", "ENG-2"), ("ENG-3", "ENG-4")]
+        )
+        self.assertEqual(snapshot["longest_chain"], 4)
+
+    def test_diff_reports_growth_through_a_cycle(self):
+        old = _snapshot([("ENG-1", "ENG-2")])
+        new = _snapshot([("ENG-1", "ENG-2"), ("ENG-2", "ENG-1"), ("ENG-2", "ENG-3")])
+        self.assertEqual(diff_snapshots(old, new)["longest_chain"], (2, 3, 1))
+
+
+class DiffSnapshotsTest(unittest.TestCase):
+    def test_reports_blocker_and_chain_changes(self):
+        old = _snapshot([("ENG-1", "ENG-2"), ("ENG-2", "ENG-3"), ("ENG-7", "ENG-8")])
+        new = _snapshot([("ENG-1", "ENG-2"), ("ENG-2", "ENG-4"), ("ENG-5", "ENG-6")])
+        diff = diff_snapshots(old, new)
+
+        self.assertEqual(diff["added_blockers"], [["ENG-2", "ENG-4"], ["ENG-5", "ENG-6"]])
+        self.assertEqual(diff["removed_blockers"], [["ENG-2", "ENG-3"], ["ENG-7", "ENG-8"]])
+        # ENG-1's chain keeps a blocker, so it is neither resolved nor new
+        self.assertEqual(diff["resolved_chains"], [["ENG-7", "ENG-8"]])
+        self.assertEqual(diff["new_chains"], [["ENG-5", "ENG-6"]])
+        self.assertEqual(diff["longest_chain"], (3, 3, 0))
+
+    def test_identical_snapshots_have_no_changes(self):
+        snapshot = _snapshot([("ENG-1", "ENG-2")])
+        diff = diff_snapshots(snapshot, snapshot)
+        self.assertEqual(
+            diff,
+            {
+                "added_blockers": [],
+                "removed_blockers": [],
+                "resolved_chains": [],
+                "new_chains": [],
+                "longest_chain": (2, 2, 0),
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
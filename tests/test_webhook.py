@@ -0,0 +1,101 @@
+import hashlib
+import hmac
+import json
+import os
+import socket
+import threading
+import time
+import unittest
+
+import requests
+
+from graph_builder import build_blocker_graph
+from webhook import WebhookRequestHandler, replay_webhooks, run_webhook_server
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SECRET = "test-secret"
+
+
+# Stands in for JiraClient: serves the recorded seed issues instead of querying Jira
+class RecordedJiraClient:
+    def __init__(self, issues: list):
+        self.issues = issues
+
+    def fetch_issues(self, project_key, sprint_codes, team_guid):
+        return self.issues
+
+
+def _load_json(name: str):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class WebhookReplayTest(unittest.TestCase):
+    """Replays recorded payloads against a local receiver (fixtures: make_webhook_fixtures.py)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.base_url = f"http://127.0.0.1:{_free_port()}"
+        server = threading.Thread(
+            target=run_webhook_server,
+            args=(
+                RecordedJiraClient(_load_json("webhook_seed.json")),
+                "ENG",
+                "1",
+                "team",
+                "127.0.0.1",
+                int(cls.base_url.rsplit(":", 1)[1]),
+            ),
+            kwargs={"secret": SECRET},
+            daemon=True,
+        )
+        server.start()
+        for _ in range(100):
+            try:
+                requests.get(f"{cls.base_url}/health", timeout=1)
+                return
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.05)
+        raise RuntimeError("Webhook receiver did not start")
+
+    def test_replayed_graph_matches_fresh_build(self):
+        replay_webhooks(
+            os.path.join(FIXTURE_DIR, "webhook_payloads.jsonl"),
+            f"{self.base_url}/webhook",
+            secret=SECRET,
+        )
+        graph, issues, node_sizes, _ = WebhookRequestHandler.service.live_graph.snapshot()
+
+        final_issues = _load_json("webhook_final.json")
+        expected_graph, _, expected_sizes = build_blocker_graph(final_issues)
+        self.assertEqual(set(graph.nodes()), set(expected_graph.nodes()))
+        self.assertEqual(set(graph.edges()), set(expected_graph.edges()))
+        self.assertEqual(node_sizes, expected_sizes)
+        self.assertEqual(
+            {issue["key"]: issue["fields"].get("parent") for issue in issues},
+            {issue["key"]: issue["fields"].get("parent") for issue in final_issues},
+        )
+
+    def test_unsigned_payload_is_rejected(self):
+        response = requests.post(f"{self.base_url}/webhook", data=b"{}")
+        self.assertEqual(response.status_code, 401)
+
+    def test_payload_that_is_not_an_object_is_rejected(self):
+        for body in (b"[]", b'"x"', b"1"):
+            signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+            response = requests.post(
+                f"{self.base_url}/webhook",
+                data=body,
+                headers={"X-Hub-Signature": f"sha256={signature}"},
+            )
+            self.assertEqual(response.status_code, 400, body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,24 +1,65 @@
 import datetime
+import hashlib
+import io
 import math
 import os
+import threading
 import typing
 
 import matplotlib.patches as patches
 import matplotlib.pyplot as plt
 import networkx as nx
-
-from config import CLUSTER_K_DIST, CLUSTER_LAYOUT, COLOR_PALETTE, NODE_K_DIST, NODE_LAYOUT
+import numpy as np
+
+from cluster_arrays import (
+    ClusterArrays,
+    circular_positions,
+    cluster_extents,
+    force_directed_positions,
+    kamada_kawai_positions,
+    planar_positions,
+)
+from config import (
+    CLUSTER_K_DIST,
+    CLUSTER_LAYOUT,
+    COLOR_PALETTE,
+    LAYOUT_ITERATIONS,
+    LAYOUT_SEED,
+    LAYOUT_THRESHOLD,
+    NODE_K_DIST,
+    NODE_LAYOUT,
+    PERFORMANCE_PROFILES,
+    PROFILE_MODE,
+)
 from jira_client import JiraClient
 
+_render_lock = threading.Lock()
+
 
 # Creates a dictionary of node positions using various graph layout algorithms
-def create_plot_points(graph: nx.DiGraph, layout_type="spring", k=0.5, iterations=50) -> typing.Any:
+# (initial_pos seeds the force-directed layouts with positions from a previous run, and they
+# stop early once nodes move less than threshold per iteration)
+def create_plot_points(
+    graph: nx.DiGraph,
+    layout_type="spring",
+    k=0.5,
+    iterations=50,
+    initial_pos=None,
+    threshold=LAYOUT_THRESHOLD,
+) -> typing.Any:
     if layout_type == "kamada-kawai":
-        return nx.kamada_kawai_layout(graph)
+        # Kamada-Kawai needs a starting position for every node, not just the known ones
+        if initial_pos and any(node not in initial_pos for node in graph):
+            initial_pos = None
+        return nx.kamada_kawai_layout(graph, pos=initial_pos)
     elif layout_type == "spring":
-        return nx.spring_layout(graph, k=k, iterations=iterations)
+        return nx.spring_layout(
+            graph, k=k, iterations=iterations, pos=initial_pos, threshold=threshold
+        )
     elif layout_type == "fruchterman_reingold":
-        return nx.fruchterman_reingold_layout(graph, k=k, iterations=iterations)
+        return nx.fruchterman_reingold_layout(
+            graph, k=k, iterations=iterations, pos=initial_pos, threshold=threshold
+        )
     elif layout_type == "circular":
         return nx.circular_layout(graph)
     elif layout_type == "planar":
@@ -27,13 +68,17 @@ def create_plot_points(graph: nx.DiGraph, layout_type="spring", k=0.5, iteration
         raise ValueError("Invalid plotting algorithm selected.")
 
 
+# Maps each issue key to its parent issue key (None for issues without a parent)
+def _issue_parents(issues: list) -> dict:
+    return {issue["key"]: issue["fields"].get("parent", {}).get("key") for issue in issues}
+
+
 # Groups nodes into clusters based on their parent issues
 def _identify_clusters(graph: nx.DiGraph, issues: list) -> dict:
     clusters: dict = {}
+    issue_parents = _issue_parents(issues)
     for node in graph.nodes():
-        parent_id = next(
-            (i["fields"].get("parent", {}).get("key") for i in issues if i["key"] == node), None
-        )
+        parent_id = issue_parents.get(node)
         if parent_id:
             clusters.setdefault(parent_id, []).append(node)
         else:
@@ -49,45 +94,159 @@ def _create_cluster_graph(clusters: dict) -> nx.Graph:
     return cluster_graph
 
 
+# Returns the cached positions for the given nodes, or None when none of them are known
+def _warm_positions(cached_pos: dict, nodes) -> typing.Optional[dict]:
+    warm_pos = {node: cached_pos[node] for node in nodes if node in cached_pos}
+    return warm_pos or None
+
+
 # Calculates the positions of each cluster in the visualization
 def _calculate_cluster_positions(
-    cluster_graph: nx.Graph, layout_type=CLUSTER_LAYOUT, k_dist=CLUSTER_K_DIST
+    cluster_graph: nx.Graph,
+    layout_type=CLUSTER_LAYOUT,
+    k_dist=CLUSTER_K_DIST,
+    position_cache=None,
+    iterations=LAYOUT_ITERATIONS,
+    threshold=LAYOUT_THRESHOLD,
 ) -> typing.Any:
-    return create_plot_points(cluster_graph, layout_type=layout_type, k=k_dist, iterations=150)
+    if position_cache is None:
+        return create_plot_points(
+            cluster_graph,
+            layout_type=layout_type,
+            k=k_dist,
+            iterations=iterations,
+            threshold=threshold,
+        )
+
+    cached_pos = position_cache.setdefault("clusters", {})
+    cluster_pos = create_plot_points(
+        cluster_graph,
+        layout_type=layout_type,
+        k=k_dist,
+        iterations=iterations,
+        initial_pos=_warm_positions(cached_pos, cluster_graph.nodes()),
+        threshold=threshold,
+    )
+    cached_pos.update(cluster_pos)
+    return cluster_pos
+
+
+# Fingerprints a cluster's tickets, the blocker links between them and the layout settings,
+# which is everything the cluster's own layout depends on
+def _cluster_fingerprint(arrays: ClusterArrays, cluster: int, layout_key: tuple) -> str:
+    nodes = arrays.cluster_nodes(cluster)
+    indptr, indices = arrays.cluster_adjacency(cluster)
+    blocks = arrays.cluster_blocks(cluster)
+    digest = hashlib.sha1(f"{layout_key}\n".encode())
+    for i in sorted(range(len(nodes)), key=nodes.__getitem__):
+        digest.update(f"n|{nodes[i]}\n".encode())
+        # Only the blocker side of each link, so reversing a link changes the fingerprint
+        row = slice(indptr[i], indptr[i + 1])
+        for target in sorted(nodes[j] for j in indices[row][blocks[row]]):
+            digest.update(f"e|{nodes[i]}|{target}\n".encode())
+    return digest.hexdigest()
+
+
+# Builds starting positions for a cluster from cached ones (NaN for nodes without one), or
+# None when none of its nodes are known
+def _warm_array(cached_pos: dict, nodes: list) -> typing.Optional[np.ndarray]:
+    if not any(node in cached_pos for node in nodes):
+        return None
+    return np.array([cached_pos.get(node, (np.nan, np.nan)) for node in nodes], dtype=float)
+
+
+# Lays out one cluster from its CSR adjacency, with the same layouts as create_plot_points
+def _layout_cluster(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    layout_type: str,
+    k: float,
+    iterations: int,
+    initial_pos: typing.Optional[np.ndarray],
+    threshold: float,
+    seed: typing.Optional[int] = None,
+    blocks: typing.Optional[np.ndarray] = None,
+) -> np.ndarray:
+    if layout_type == "kamada-kawai":
+        # Kamada-Kawai needs a starting position for every node, not just the known ones
+        if initial_pos is not None and np.isnan(initial_pos).any():
+            initial_pos = None
+        return kamada_kawai_positions(indptr, indices, initial=initial_pos, blocks=blocks)
+    elif layout_type in ("spring", "fruchterman_reingold"):
+        return force_directed_positions(
+            indptr, indices, k, iterations, threshold, initial=initial_pos, seed=seed, blocks=blocks
+        )
+    elif layout_type == "circular":
+        return circular_positions(len(indptr) - 1)
+    elif layout_type == "planar":
+        return planar_positions(indptr, indices)
+    else:
+        raise ValueError("Invalid plotting algorithm selected.")
 
 
-# Calculates the positions of nodes within each cluster
+# Calculates the positions of nodes within each cluster, relative to the cluster center and
+# in the node order of arrays
+# (with a position_cache, clusters whose fingerprint is unchanged keep their cached layout)
 def _calculate_sub_node_positions(
-    graph: nx.DiGraph,
-    clusters: dict,
-    cluster_pos: dict,
+    arrays: ClusterArrays,
     layout_type=NODE_LAYOUT,
     k_dist=NODE_K_DIST,
-) -> dict:
-    node_pos = {}
-    for parent_id, nodes in clusters.items():
-        subgraph = graph.subgraph(nodes)
-        sub_pos = create_plot_points(subgraph, layout_type=layout_type, k=k_dist, iterations=150)
-        for node, (x, y) in sub_pos.items():
-            node_pos[node] = (x + cluster_pos[parent_id][0], y + cluster_pos[parent_id][1])
-    return node_pos
+    position_cache=None,
+    iterations=LAYOUT_ITERATIONS,
+    threshold=LAYOUT_THRESHOLD,
+    seed=LAYOUT_SEED,
+) -> np.ndarray:
+    sub_pos = np.empty((len(arrays.nodes), 2))
+    cached_pos = position_cache.setdefault("nodes", {}) if position_cache is not None else {}
+    # Only worth reporting on runs that could reuse earlier layouts (not one-shot CLI runs)
+    reused_cache = bool(cached_pos)
+    fingerprints = (
+        position_cache.setdefault("cluster_fingerprints", {}) if position_cache is not None else {}
+    )
+    laid_out = 0
+    for cluster, parent_id in enumerate(arrays.cluster_ids):
+        nodes = arrays.cluster_nodes(cluster)
+        start, end = arrays.offsets[cluster], arrays.offsets[cluster + 1]
+        fingerprint = (
+            _cluster_fingerprint(arrays, cluster, (layout_type, k_dist, iterations, threshold))
+            if position_cache is not None
+            else None
+        )
+        if (
+            fingerprint is not None
+            and fingerprints.get(parent_id) == fingerprint
+            and all(node in cached_pos for node in nodes)
+        ):
+            # Unchanged cluster: keep its previous layout instead of computing it again
+            sub_pos[start:end] = [cached_pos[node] for node in nodes]
+        else:
+            laid_out += 1
+            indptr, indices = arrays.cluster_adjacency(cluster)
+            sub_pos[start:end] = _layout_cluster(
+                indptr,
+                indices,
+                layout_type,
+                k_dist,
+                iterations,
+                _warm_array(cached_pos, nodes),
+                threshold,
+                seed,
+                arrays.cluster_blocks(cluster),
+            )
+        if position_cache is not None:
+            # Positions are relative to the cluster center, so they survive cluster moves
+            cached_pos.update(zip(nodes, map(tuple, sub_pos[start:end].tolist())))
+            fingerprints[parent_id] = fingerprint
+    if reused_cache:
+        unchanged = len(arrays.cluster_ids) - laid_out
+        print(f"Laid out {laid_out} of {len(arrays.cluster_ids)} clusters ({unchanged} unchanged)")
+    return sub_pos
 
 
 # Determines the radius needed for each cluster based on the positions of nodes within it
-def _calculate_cluster_radii(
-    graph: nx.DiGraph, clusters: dict, cluster_pos: dict, node_pos: dict
-) -> dict:
-    cluster_radii = {}
-    for parent_id, nodes in clusters.items():
-        max_dist = 0.0
-        for node in nodes:
-            x, y = node_pos[node]
-            dist = math.sqrt(
-                (x - cluster_pos[parent_id][0]) ** 2 + (y - cluster_pos[parent_id][1]) ** 2
-            )
-            max_dist = max(max_dist, dist)
-        cluster_radii[parent_id] = max_dist * 1.2
-    return cluster_radii
+def _calculate_cluster_radii(arrays: ClusterArrays, sub_pos: np.ndarray) -> dict:
+    radii = cluster_extents(sub_pos, arrays.offsets) * 1.2
+    return dict(zip(arrays.cluster_ids, radii.tolist()))
 
 
 # Adjusts cluster positions to prevent overlap between clusters
@@ -115,37 +274,36 @@ def _adjust_cluster_positions(clusters: dict, cluster_pos: dict, cluster_radii:
     return adjusted_cluster_pos
 
 
-# Updates node positions based on the adjusted cluster positions
+# Places each node at its cluster's adjusted center plus its position within the cluster
 def _apply_adjusted_cluster_positions(
-    clusters: dict, node_pos: dict, adjusted_cluster_pos: dict, cluster_pos: dict
+    arrays: ClusterArrays, sub_pos: np.ndarray, adjusted_cluster_pos: dict
 ) -> dict:
-    adjusted_node_pos = {}
-    for node, (x, y) in node_pos.items():
-        parent_id = next(pid for pid, nodes in clusters.items() if node in nodes)
-        x_diff = adjusted_cluster_pos[parent_id][0] - cluster_pos[parent_id][0]
-        y_diff = adjusted_cluster_pos[parent_id][1] - cluster_pos[parent_id][1]
-        adjusted_node_pos[node] = (x + x_diff, y + y_diff)
-    return adjusted_node_pos
+    centers = np.array([adjusted_cluster_pos[parent_id] for parent_id in arrays.cluster_ids])
+    node_pos = sub_pos + np.repeat(centers.reshape(-1, 2), np.diff(arrays.offsets), axis=0)
+    return dict(zip(arrays.nodes, map(tuple, node_pos.tolist())))
 
 
 # Assigns colors to nodes based on their parent issues
+# (parent summaries come from known_parent_names when given, otherwise from Jira)
 def _calculate_node_colors(
-    graph: nx.DiGraph, issues: list, jira_client: JiraClient
+    graph: nx.DiGraph, issues: list, jira_client, known_parent_names=None
 ) -> typing.Tuple[list, dict, dict]:
-    color_cmap = plt.cm.get_cmap(COLOR_PALETTE, len(_identify_clusters(graph, issues)))
+    color_cmap = plt.get_cmap(COLOR_PALETTE, len(_identify_clusters(graph, issues)))
     color_cycle = [color_cmap(i) for i in range(color_cmap.N)]
     node_colors: list = []
     parent_colors: dict = {}
     parent_names: dict = {}
 
+    issue_parents = _issue_parents(issues)
     for node in graph.nodes():
-        parent_id = next(
-            (i["fields"].get("parent", {}).get("key") for i in issues if i["key"] == node), None
-        )
+        parent_id = issue_parents.get(node)
         if parent_id:
             if parent_id not in parent_colors:
                 parent_colors[parent_id] = color_cycle[len(parent_colors) % len(color_cycle)]
-                parent_names[parent_id] = jira_client.fetch_parent_issue_summary(parent_id)
+                if known_parent_names is not None and parent_id in known_parent_names:
+                    parent_names[parent_id] = known_parent_names[parent_id]
+                else:
+                    parent_names[parent_id] = jira_client.fetch_parent_issue_summary(parent_id)
             node_colors.append(parent_colors[parent_id])
         else:
             node_colors.append("lightgray")
@@ -164,8 +322,20 @@ def _format_sprint_title(sprint_codes: str) -> str:
         return f"Sprint {sprint_codes.strip()}"
 
 
-# Renders the graph with all visual elements including nodes, edges, clusters, and legend
-def _draw_graph(
+# Finds the center and radius of the dashed circle drawn around a cluster
+def _cluster_circle(nodes: list, node_pos: dict) -> typing.Tuple[typing.Tuple[float, float], float]:
+    cluster_x = [node_pos[node][0] for node in nodes]
+    cluster_y = [node_pos[node][1] for node in nodes]
+    center_x = sum(cluster_x) / len(cluster_x)
+    center_y = sum(cluster_y) / len(cluster_y)
+    radius = (
+        max(max(abs(x - center_x), abs(y - center_y)) for x, y in zip(cluster_x, cluster_y)) * 1.2
+    )
+    return (center_x, center_y), radius
+
+
+def draw_graph_artists(
+    ax,
     graph: nx.DiGraph,
     node_pos: dict,
     node_colors: list,
@@ -174,61 +344,361 @@ def _draw_graph(
     parent_colors: dict,
     parent_names: dict,
     clusters: dict,
-    save_path=None,
-):
-    plt.figure(figsize=(12, 10))
-    nx.draw(
+    team_name=None,
+    title=None,
+) -> dict:
+    """
+    Draw the nodes, edges, labels, cluster circles, title and legend on a matplotlib Axes.
+
+    The title describes the sprints and team, unless a title is given.
+
+    Returns:
+        Dictionary of the drawn artists, which update_graph_artists can move without drawing
+        the graph again
+    """
+    nodelist = list(graph.nodes())
+    edgelist = list(graph.edges())
+    sizes = [node_sizes[node] for node in nodelist]
+    nodes = nx.draw_networkx_nodes(
+        graph, node_pos, nodelist=nodelist, node_color=node_colors, node_size=sizes, ax=ax
+    )
+    edges = nx.draw_networkx_edges(
         graph,
         node_pos,
-        with_labels=True,
-        labels={k: k for k in graph.nodes()},
-        node_color=node_colors,
-        node_size=[node_sizes[node] for node in graph.nodes()],
-        font_size=8,
-        font_color="black",
+        edgelist=edgelist,
+        nodelist=nodelist,
+        node_size=sizes,
         arrowsize=20,
+        ax=ax,
+    )
+    labels = nx.draw_networkx_labels(
+        graph, node_pos, labels={k: k for k in nodelist}, font_size=8, font_color="black", ax=ax
     )
 
-    # Format the sprint title based on whether there are multiple sprints
-    sprint_title = _format_sprint_title(sprint_codes)
-    plt.title(f"Jira Blocker Chains - {sprint_title}")
+    ax.set_title(format_graph_title(sprint_codes, team_name, title=title))
 
-    handles = [plt.Rectangle((0, 0), 1, 1, color=color) for color in parent_colors.values()]
-    labels = [f"{parent_names.get(key, key)} ({key})" for key in parent_colors]
+    handles = [patches.Rectangle((0, 0), 1, 1, color=color) for color in parent_colors.values()]
+    legend_labels = [f"{parent_names.get(key, key)} ({key})" for key in parent_colors]
     if handles:
-        plt.legend(handles, labels, title="Parent Issues")
-    for parent_id, nodes in clusters.items():
-        cluster_x = [node_pos[node][0] for node in nodes]
-        cluster_y = [node_pos[node][1] for node in nodes]
-        center_x = sum(cluster_x) / len(cluster_x)
-        center_y = sum(cluster_y) / len(cluster_y)
-        radius = (
-            max(max(abs(x - center_x), abs(y - center_y)) for x, y in zip(cluster_x, cluster_y))
-            * 1.2
+        ax.legend(handles, legend_labels, title="Parent Issues")
+
+    circles = {}
+    for parent_id, cluster_nodes in clusters.items():
+        center, radius = _cluster_circle(cluster_nodes, node_pos)
+        circles[parent_id] = patches.Circle(
+            center, radius, fill=False, edgecolor="gray", linestyle="--"
         )
-        circle = patches.Circle(
-            (center_x, center_y), radius, fill=False, edgecolor="gray", linestyle="--"
+        ax.add_patch(circles[parent_id])
+
+    ax.set_axis_off()
+    return {
+        "nodelist": nodelist,
+        "edgelist": edgelist,
+        "nodes": nodes,
+        "edges": edges,
+        "labels": labels,
+        "circles": circles,
+    }
+
+
+def update_graph_artists(ax, artists: dict, node_pos: dict, clusters: dict):
+    """Move the artists returned by draw_graph_artists to new node positions"""
+    artists["nodes"].set_offsets([node_pos[node] for node in artists["nodelist"]])
+    for edge, (source, target) in zip(artists["edges"], artists["edgelist"]):
+        edge.set_positions(node_pos[source], node_pos[target])
+    for node, label in artists["labels"].items():
+        label.set_position(node_pos[node])
+
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+    for parent_id, cluster_nodes in clusters.items():
+        (center_x, center_y), radius = _cluster_circle(cluster_nodes, node_pos)
+        artists["circles"][parent_id].set_center((center_x, center_y))
+        artists["circles"][parent_id].set_radius(radius)
+        min_x, max_x = min(min_x, center_x - radius), max(max_x, center_x + radius)
+        min_y, max_y = min(min_y, center_y - radius), max(max_y, center_y + radius)
+
+    # The circles enclose every node, so they define the visible area
+    margin = max(max_x - min_x, max_y - min_y, 1e-6) * 0.05
+    ax.set_xlim(min_x - margin, max_x + margin)
+    ax.set_ylim(min_y - margin, max_y + margin)
+
+
+# Renders the graph with all visual elements including nodes, edges, clusters, and legend
+# (save_path may be a file path or a binary file object, image_format defaults to the extension)
+def _draw_graph(
+    graph: nx.DiGraph,
+    node_pos: dict,
+    node_colors: list,
+    node_sizes: dict,
+    sprint_codes: str,
+    parent_colors: dict,
+    parent_names: dict,
+    clusters: dict,
+    save_path=None,
+    image_format=None,
+    team_name=None,
+    dpi=None,
+    title=None,
+    before_show=None,
+):
+    # pyplot keeps global state, so renders started from different threads take turns
+    with _render_lock:
+        plt.figure(figsize=(12, 10))
+        draw_graph_artists(
+            plt.gca(),
+            graph,
+            node_pos,
+            node_colors,
+            node_sizes,
+            sprint_codes,
+            parent_colors,
+            parent_names,
+            clusters,
+            team_name=team_name,
+            title=title,
         )
-        plt.gca().add_patch(circle)
 
-    if save_path:
-        plt.savefig(save_path, bbox_inches="tight")
-        plt.close()
-        return save_path
-    else:
-        plt.show()
+        if save_path:
+            plt.savefig(save_path, bbox_inches="tight", format=image_format, dpi=dpi)
+            plt.close()
+            return save_path
+        else:
+            if before_show:
+                before_show()
+            plt.show()
+            return None
+
+
+# Fills in the default layout settings for anything not provided
+def _resolve_layout_settings(layout_settings) -> typing.Tuple[str, str, float, float]:
+    layout_settings = layout_settings or {}
+    return (
+        layout_settings.get("cluster_layout", CLUSTER_LAYOUT),
+        layout_settings.get("node_layout", NODE_LAYOUT),
+        layout_settings.get("cluster_k", CLUSTER_K_DIST),
+        layout_settings.get("node_k", NODE_K_DIST),
+    )
+
+
+# Looks up the performance profile named by the layout settings ("profile" key)
+def _resolve_profile(layout_settings) -> dict:
+    return PERFORMANCE_PROFILES[(layout_settings or {}).get("profile", PROFILE_MODE)]
+
+
+def layout_graph(
+    graph: nx.DiGraph, issues: list, layout_settings=None, position_cache=None
+) -> typing.Tuple[dict, dict]:
+    """
+    Compute the clusters and final node positions of a blocker graph.
+
+    Args:
+        graph: NetworkX DiGraph of blocker relationships
+        issues: List of Jira issues
+        layout_settings: Optional dictionary with custom layout settings (see visualize_graph)
+        position_cache: Optional dictionary that keeps layout positions between calls. The final
+            node positions of the last call are stored under "layout". Clusters whose tickets,
+            blocker links and layout settings are unchanged since the last call keep their
+            layout, so only changed clusters are laid out again.
+
+    Returns:
+        Tuple of (clusters, node positions)
+    """
+    cluster_layout, node_layout, cluster_k, node_k = _resolve_layout_settings(layout_settings)
+    profile = _resolve_profile(layout_settings)
+
+    # Log the layout settings being used
+    print(f"Settings - Cluster: {cluster_layout} (k={cluster_k}), Node: {node_layout} (k={node_k})")
+
+    # Without use_cache this call lays everything out from scratch, and leaves the cached
+    # positions for other calls sharing the cache untouched (only the final positions are
+    # stored below)
+    layout_cache = position_cache if profile["use_cache"] else None
+
+    clusters = _identify_clusters(graph, issues)
+    cluster_graph = _create_cluster_graph(clusters)
+    cluster_pos = _calculate_cluster_positions(
+        cluster_graph,
+        layout_type=cluster_layout,
+        k_dist=cluster_k,
+        position_cache=layout_cache,
+        iterations=profile["layout_iterations"],
+        threshold=profile["layout_threshold"],
+    )
+    arrays = ClusterArrays(graph, clusters)
+    sub_pos = _calculate_sub_node_positions(
+        arrays,
+        layout_type=node_layout,
+        k_dist=node_k,
+        position_cache=layout_cache,
+        iterations=profile["layout_iterations"],
+        threshold=profile["layout_threshold"],
+    )
+    cluster_radii = _calculate_cluster_radii(arrays, sub_pos)
+    adjusted_cluster_pos = _adjust_cluster_positions(clusters, cluster_pos, cluster_radii)
+    adjusted_node_pos = _apply_adjusted_cluster_positions(arrays, sub_pos, adjusted_cluster_pos)
+    if position_cache is not None:
+        # The final positions, for callers that persist them (e.g. snapshots)
+        position_cache["layout"] = adjusted_node_pos
+    return clusters, adjusted_node_pos
+
+
+def prepare_graph_drawing(
+    graph: nx.DiGraph,
+    issues: list,
+    jira_client: JiraClient,
+    layout_settings=None,
+    position_cache=None,
+) -> dict:
+    """
+    Compute everything needed to draw a blocker graph, without drawing it.
+
+    Returns:
+        Dictionary with "clusters", "node_pos", "node_colors", "parent_colors" and
+        "parent_names", matching the arguments of draw_graph_artists
+    """
+    clusters, node_pos = layout_graph(graph, issues, layout_settings, position_cache)
+    node_colors, parent_colors, parent_names = _calculate_node_colors(graph, issues, jira_client)
+    return {
+        "clusters": clusters,
+        "node_pos": node_pos,
+        "node_colors": node_colors,
+        "parent_colors": parent_colors,
+        "parent_names": parent_names,
+    }
+
+
+def prepare_graph_styles(
+    graph: nx.DiGraph, issues: list, jira_client: typing.Optional[JiraClient], parent_names=None
+) -> dict:
+    """
+    Compute the clusters and colors of a blocker graph without laying it out.
+
+    Returns:
+        Dictionary with "clusters", "node_colors" (in graph.nodes() order), "parent_colors"
+        and "parent_names"
+    """
+    node_colors, parent_colors, parent_names = _calculate_node_colors(
+        graph, issues, jira_client, known_parent_names=parent_names
+    )
+    return {
+        "clusters": _identify_clusters(graph, issues),
+        "node_colors": node_colors,
+        "parent_colors": parent_colors,
+        "parent_names": parent_names,
+    }
+
+
+def format_graph_title(sprint_codes: str, team_name=None, title=None) -> str:
+    """Build the title shown above a graph, from the sprints and team or from a given title"""
+    if title:
+        return f"Jira Blocker Chains - {title}"
+    sprint_title = _format_sprint_title(sprint_codes)
+    if team_name:
+        sprint_title = f"{team_name} - {sprint_title}"
+    return f"Jira Blocker Chains - {sprint_title}"
+
+
+def graph_to_dict(
+    graph: nx.DiGraph,
+    issues: list,
+    node_sizes: dict,
+    jira_client: JiraClient,
+    layout_settings=None,
+    position_cache=None,
+) -> dict:
+    """
+    Build a JSON-serializable description of a laid out blocker graph.
+
+    Returns:
+        Dictionary with "nodes" (key, parent, size, x, y), "edges" ([source, target] pairs)
+        and "clusters" (parent key, parent summary, member keys)
+    """
+    if graph.number_of_nodes() == 0:
+        return {"nodes": [], "edges": [], "clusters": []}
+
+    clusters, node_pos = layout_graph(graph, issues, layout_settings, position_cache)
+    node_parents = {node: parent_id for parent_id, nodes in clusters.items() for node in nodes}
+    parent_names = {
+        parent_id: jira_client.fetch_parent_issue_summary(parent_id)
+        for parent_id in clusters
+        if parent_id != "orphan"
+    }
+    return {
+        "nodes": [
+            {
+                "key": node,
+                "parent": node_parents[node],
+                "size": node_sizes[node],
+                "x": float(node_pos[node][0]),
+                "y": float(node_pos[node][1]),
+            }
+            for node in graph.nodes()
+        ],
+        "edges": [[source, target] for source, target in graph.edges()],
+        "clusters": [
+            {"key": parent_id, "name": parent_names.get(parent_id, parent_id), "nodes": nodes}
+            for parent_id, nodes in clusters.items()
+        ],
+    }
+
+
+def render_graph(
+    graph: nx.DiGraph,
+    issues: list,
+    node_sizes: dict,
+    jira_client: JiraClient,
+    sprint_codes: str,
+    image_format="png",
+    layout_settings=None,
+    position_cache=None,
+) -> typing.Optional[bytes]:
+    """
+    Render a blocker graph to an in-memory image.
+
+    Args:
+        image_format: Any image format supported by matplotlib, e.g. "png" or "svg"
+        (the other arguments are the same as for visualize_graph)
+
+    Returns:
+        The encoded image, or None if the graph has no blocker chains
+    """
+    if graph.number_of_nodes() == 0:
         return None
 
+    clusters, node_pos = layout_graph(graph, issues, layout_settings, position_cache)
+    node_colors, parent_colors, parent_names = _calculate_node_colors(graph, issues, jira_client)
+    buffer = io.BytesIO()
+    _draw_graph(
+        graph,
+        node_pos,
+        node_colors,
+        node_sizes,
+        sprint_codes,
+        parent_colors,
+        parent_names,
+        clusters,
+        save_path=buffer,
+        image_format=image_format,
+        dpi=_resolve_profile(layout_settings)["dpi"],
+    )
+    return buffer.getvalue()
+
 
 # Main visualization function that orchestrates the entire graph rendering process
 def visualize_graph(
     graph: nx.DiGraph,
     issues: list,
     node_sizes: dict,
-    jira_client: JiraClient,
+    jira_client: typing.Optional[JiraClient],
     sprint_codes: str,
     save_file=True,
     layout_settings=None,
+    position_cache=None,
+    parent_names=None,
+    team_name=None,
+    title=None,
+    before_show=None,
 ):
     """
     Generate and visualize a graph of Jira blocker chains.
@@ -237,7 +707,7 @@ def visualize_graph(
         graph: NetworkX DiGraph of blocker relationships
         issues: List of Jira issues
         node_sizes: Dictionary of node sizes
-        jira_client: JiraClient instance
+        jira_client: JiraClient instance (may be None when parent_names covers every parent)
         sprint_codes: Sprint code(s) as a string (comma-separated if multiple)
         save_file: Whether to save the graph to a file (True) or display it (False)
         layout_settings: Optional dictionary with custom layout settings:
@@ -245,6 +715,19 @@ def visualize_graph(
             - node_layout: Layout algorithm for nodes within clusters
             - cluster_k: K distance parameter for cluster layout
             - node_k: K distance parameter for node layout
+            - profile: Name of a performance profile in PERFORMANCE_PROFILES, which sets the
+              layout iterations and convergence threshold, whether cached positions are
+              reused, and the resolution of saved images
+        position_cache: Optional dictionary that keeps layout positions between calls. Positions
+            from the previous call seed the force-directed layouts, and clusters that did not
+            change keep their layout, so repeated renders of a slowly changing graph are faster
+            and stay visually stable.
+        parent_names: Optional dictionary of parent summaries fetched beforehand
+        team_name: Optional team name added to the title and the file name
+        title: Optional title used instead of the sprints and team, for graphs that are not a
+            sprint scope (e.g. graph store queries). It also names the saved file
+        before_show: Optional callable run once the graph is drawn, just before the window
+            opens and blocks (e.g. to stop a timer)
 
     Returns:
         Path to the saved file or None if displayed
@@ -253,37 +736,11 @@ def visualize_graph(
         print("No blocker chains found in the specified sprints.")
         return None
 
-    # Get layout settings
-    cluster_layout = CLUSTER_LAYOUT
-    node_layout = NODE_LAYOUT
-    cluster_k = CLUSTER_K_DIST
-    node_k = NODE_K_DIST
-
-    if layout_settings:
-        # Override defaults with custom settings if provided
-        cluster_layout = layout_settings.get("cluster_layout", CLUSTER_LAYOUT)
-        node_layout = layout_settings.get("node_layout", NODE_LAYOUT)
-        cluster_k = layout_settings.get("cluster_k", CLUSTER_K_DIST)
-        node_k = layout_settings.get("node_k", NODE_K_DIST)
-
-    # Log the layout settings being used
-    print(f"Settings - Cluster: {cluster_layout} (k={cluster_k}), Node: {node_layout} (k={node_k})")
-
-    clusters = _identify_clusters(graph, issues)
-    cluster_graph = _create_cluster_graph(clusters)
-    cluster_pos = _calculate_cluster_positions(
-        cluster_graph, layout_type=cluster_layout, k_dist=cluster_k
+    cluster_layout, node_layout, _, _ = _resolve_layout_settings(layout_settings)
+    clusters, adjusted_node_pos = layout_graph(graph, issues, layout_settings, position_cache)
+    node_colors, parent_colors, parent_names = _calculate_node_colors(
+        graph, issues, jira_client, known_parent_names=parent_names
     )
-    node_pos = _calculate_sub_node_positions(
-        graph, clusters, cluster_pos, layout_type=node_layout, k_dist=node_k
-    )
-    cluster_radii = _calculate_cluster_radii(graph, clusters, cluster_pos, node_pos)
-    adjusted_cluster_pos = _adjust_cluster_positions(clusters, cluster_pos, cluster_radii)
-    adjusted_node_pos = _apply_adjusted_cluster_positions(
-        clusters, node_pos, adjusted_cluster_pos, cluster_pos
-    )
-    node_colors, parent_colors, parent_names = _calculate_node_colors(graph, issues, jira_client)
-
     if save_file:
         # Create output directory if it doesn't exist
         output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
@@ -293,7 +750,9 @@ def visualize_graph(
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Use a simplified version of sprint codes for the filename
-        sprint_filename = sprint_codes.replace(",", "_").replace(" ", "")
+        sprint_filename = (title or sprint_codes).replace(",", "_").replace(" ", "")
+        if team_name:
+            sprint_filename = f"{team_name.replace(' ', '')}_{sprint_filename}"
         layout_info = f"{cluster_layout}_{node_layout}"
         filename = f"blocker_chain_{sprint_filename}_{layout_info}_{timestamp}.png"
         save_path = os.path.join(output_dir, filename)
@@ -308,6 +767,9 @@ def visualize_graph(
             parent_names,
             clusters,
             save_path=save_path,
+            team_name=team_name,
+            dpi=_resolve_profile(layout_settings)["dpi"],
+            title=title,
         )
         print(f"Graph saved to: {save_path}")
         return save_path
@@ -322,4 +784,7 @@ def visualize_graph(
             parent_colors,
             parent_names,
             clusters,
+            team_name=team_name,
+            title=title,
+            before_show=before_show,
         )
@@ -0,0 +1,80 @@
+import time
+
+from config import EXPAND_MAX_ISSUES
+from graph_builder import build_blocker_graph, expand_blocker_scope, graph_fingerprint
+from jira_client import GRAPH_FIELDS, JiraClient
+from visualizer import visualize_graph
+
+
+def run_watch_mode(
+    jira_client: JiraClient,
+    project_key: str,
+    sprint_codes: str,
+    team_guid: str,
+    layout_settings: dict,
+    interval: float,
+    expand_depth=0,
+    expand_limit=EXPAND_MAX_ISSUES,
+):
+    """
+    Poll Jira and regenerate the graph only when the blocker graph structure changes.
+
+    Each poll fetches just the fields the graph is built from and compares a structural
+    fingerprint with the previous poll. Layout and rendering only run when the fingerprint
+    changes. The client (and its parent summary cache) and the layout positions are kept
+    between polls, so a changed graph is laid out starting from the previous positions.
+
+    Args:
+        jira_client: JiraClient instance reused for every poll
+        project_key: The Jira project key
+        sprint_codes: Comma-separated list of sprint codes
+        team_guid: The team's GUID
+        layout_settings: Dictionary with layout settings for the visualizer
+        interval: Number of seconds to wait between polls
+        expand_depth: Number of blocker hops to follow outside the selected sprints
+        expand_limit: Maximum number of extra tickets fetched by expansion
+    """
+    last_fingerprint = None
+    position_cache: dict = {}
+    print(f"Watching for blocker graph changes every {interval:g} seconds (Ctrl+C to stop)")
+
+    try:
+        while True:
+            started_at = time.perf_counter()
+            try:
+                issues = jira_client.fetch_issues(
+                    project_key, sprint_codes, team_guid, fields=GRAPH_FIELDS
+                )
+                if expand_depth > 0:
+                    issues = expand_blocker_scope(
+                        issues,
+                        jira_client,
+                        expand_depth,
+                        max_issues=expand_limit,
+                        fields=GRAPH_FIELDS,
+                    )
+                graph, _, node_sizes = build_blocker_graph(issues)
+
+                fingerprint = graph_fingerprint(graph, issues)
+                if fingerprint == last_fingerprint:
+                    print("No blocker graph changes detected, skipping render")
+                else:
+                    visualize_graph(
+                        graph,
+                        issues,
+                        node_sizes,
+                        jira_client,
+                        sprint_codes,
+                        save_file=True,
+                        layout_settings=layout_settings,
+                        position_cache=position_cache,
+                    )
+                    last_fingerprint = fingerprint
+            except ValueError as e:
+                # A failed poll keeps the previous graph, the next poll tries again
+                print(f"An error occurred: {e}")
+
+            print(f"Poll took {time.perf_counter() - started_at:.2f} seconds")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
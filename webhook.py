@@ -0,0 +1,427 @@
+import hashlib
+import hmac
+import json
+import threading
+import typing
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import matplotlib.pyplot as plt
+import networkx as nx
+import requests
+
+from config import DEFAULT_DOT_SIZE, DOT_SCALING_AMOUNT
+from html_export import build_html_data, render_html
+from jira_client import JiraClient
+from visualizer import render_graph
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "html": "text/html; charset=utf-8",
+}
+
+
+# Returns the cluster a ticket is drawn in (its parent key, or "orphan")
+def _issue_cluster(issue: dict) -> str:
+    return (issue["fields"].get("parent") or {}).get("key") or "orphan"
+
+
+# Reads the keys of the tickets an issue blocks from its "Blocks" links
+def _blocked_keys(issue: dict) -> set:
+    return {
+        link["outwardIssue"]["key"]
+        for link in issue["fields"].get("issuelinks") or []
+        if "outwardIssue" in link and link["type"]["name"] == "Blocks"
+    }
+
+
+def _is_done(issue: dict) -> bool:
+    return (issue["fields"].get("status") or {}).get("name", "").upper() == "DONE"
+
+
+class LiveBlockerGraph:
+    """
+    Blocker graph of a scope, kept up to date from Jira webhook events.
+
+    The graph is seeded from one fetch and then changed in place: each event only touches the
+    tickets and links it names, so applying it costs O(changed edges) instead of a new fetch
+    and build.
+
+    Only tickets of the seeded scope are tracked. Tickets that are added to the sprints later
+    show up after the next full fetch (restarting the receiver).
+    """
+
+    def __init__(self, issues: list):
+        self.lock = threading.Lock()
+        # Every ticket of the scope, including the ones closed since, by key
+        self.issues: typing.Dict[str, dict] = {}
+        self.keys_by_id: typing.Dict[str, str] = {}
+        self.blocks: typing.Dict[str, set] = {}
+        self.blocked_by: typing.Dict[str, set] = {}
+        self.open_keys: set = set()
+        self.graph = nx.DiGraph()
+        # Increases with every change, so renders can tell whether they are stale
+        self.version = 0
+
+        for issue in issues:
+            self._track(issue)
+        for key in self.open_keys:
+            for blocked_key in self.blocks[key]:
+                if blocked_key in self.open_keys:
+                    self.graph.add_edge(key, blocked_key)
+
+    def _track(self, issue: dict):
+        key = issue["key"]
+        self.issues[key] = issue
+        self.keys_by_id[str(issue.get("id"))] = key
+        for blocked_key in self.blocks.get(key, set()):
+            self.blocked_by[blocked_key].discard(key)
+        self.blocks[key] = _blocked_keys(issue)
+        for blocked_key in self.blocks[key]:
+            self.blocked_by.setdefault(blocked_key, set()).add(key)
+        if not _is_done(issue):
+            self.open_keys.add(key)
+
+    def snapshot(self) -> typing.Tuple[nx.DiGraph, list, dict, int]:
+        """
+        Copy the current state for rendering.
+
+        Returns:
+            Tuple of (chain graph, open issues, node sizes, version), where the first three
+            match what build_blocker_graph would return for a fresh fetch
+        """
+        with self.lock:
+            graph = self.graph.copy()
+            issues = [self.issues[key] for key in sorted(self.open_keys)]
+            node_sizes = {
+                key: (
+                    DEFAULT_DOT_SIZE + DOT_SCALING_AMOUNT * self.graph.out_degree(key)
+                    if key in self.graph
+                    else DEFAULT_DOT_SIZE
+                )
+                for key in self.open_keys
+            }
+            return graph, issues, node_sizes, self.version
+
+    def apply_event(self, payload: dict) -> bool:
+        """
+        Apply one Jira webhook payload to the graph.
+
+        Handles jira:issue_updated, jira:issue_deleted, issuelink_created and
+        issuelink_deleted events. Other events and tickets outside the scope are ignored.
+
+        Returns:
+            Whether the blocker graph changed
+        """
+        event = payload.get("webhookEvent", "")
+        with self.lock:
+            before = self.version
+            if event == "jira:issue_updated" and "issue" in payload:
+                self._update_issue(payload["issue"])
+            elif event == "jira:issue_deleted" and "issue" in payload:
+                self._close_issue(payload["issue"]["key"])
+            elif event in ("issuelink_created", "issuelink_deleted") and "issueLink" in payload:
+                self._update_link(payload["issueLink"], created=event == "issuelink_created")
+            return self.version != before
+
+    def _add_edge(self, blocker_key: str, blocked_key: str):
+        if blocked_key in self.open_keys and not self.graph.has_edge(blocker_key, blocked_key):
+            self.graph.add_edge(blocker_key, blocked_key)
+            self.version += 1
+
+    def _remove_edge(self, blocker_key: str, blocked_key: str):
+        if self.graph.has_edge(blocker_key, blocked_key):
+            self.graph.remove_edge(blocker_key, blocked_key)
+            for key in (blocker_key, blocked_key):
+                if self.graph.degree(key) == 0:
+                    self.graph.remove_node(key)
+            self.version += 1
+
+    def _update_issue(self, issue: dict):
+        key = issue["key"]
+        if key not in self.issues:
+            return
+        if _is_done(issue):
+            self._close_issue(key)
+            self._track(issue)
+            return
+
+        old_cluster = _issue_cluster(self.issues[key])
+        old_blocks = self.blocks[key]
+        reopened = key not in self.open_keys
+        self._track(issue)
+        new_blocks = self.blocks[key]
+
+        if reopened:
+            self._open_issue(key)
+        else:
+            for blocked_key in old_blocks - new_blocks:
+                self._remove_edge(key, blocked_key)
+            for blocked_key in new_blocks - old_blocks:
+                self._add_edge(key, blocked_key)
+        if key in self.graph and _issue_cluster(issue) != old_cluster:
+            # The ticket moved to another parent, so it is drawn in another cluster
+            self.version += 1
+
+    def _open_issue(self, key: str):
+        self.open_keys.add(key)
+        for blocked_key in self.blocks[key]:
+            self._add_edge(key, blocked_key)
+        # Tickets linked to this one kept their outward links while it was closed
+        for blocker_key in self.blocked_by.get(key, set()) & self.open_keys:
+            self._add_edge(blocker_key, key)
+
+    def _close_issue(self, key: str):
+        if key not in self.open_keys:
+            return
+        if key in self.graph:
+            for blocker_key, blocked_key in list(self.graph.in_edges(key)) + list(
+                self.graph.out_edges(key)
+            ):
+                self._remove_edge(blocker_key, blocked_key)
+        self.open_keys.discard(key)
+
+    def _update_link(self, issue_link: dict, created: bool):
+        if (issue_link.get("issueLinkType") or {}).get("name") != "Blocks":
+            return
+        blocker_key = self.keys_by_id.get(str(issue_link.get("sourceIssueId")))
+        blocked_key = self.keys_by_id.get(str(issue_link.get("destinationIssueId")))
+        if blocker_key is None or blocked_key is None:
+            return
+
+        # Keep the stored issue links in line, so a later issue update diffs correctly
+        links = self.issues[blocker_key]["fields"].setdefault("issuelinks", [])
+        if created:
+            self.blocks[blocker_key].add(blocked_key)
+            self.blocked_by.setdefault(blocked_key, set()).add(blocker_key)
+            links.append(
+                {
+                    "id": str(issue_link.get("id")),
+                    "type": {"name": "Blocks"},
+                    "outwardIssue": {"key": blocked_key},
+                }
+            )
+            if blocker_key in self.open_keys:
+                self._add_edge(blocker_key, blocked_key)
+        else:
+            self.blocks[blocker_key].discard(blocked_key)
+            self.blocked_by.get(blocked_key, set()).discard(blocker_key)
+            links[:] = [
+                link
+                for link in links
+                if not (
+                    link["type"]["name"] == "Blocks"
+                    and link.get("outwardIssue", {}).get("key") == blocked_key
+                )
+            ]
+            self._remove_edge(blocker_key, blocked_key)
+
+
+class WebhookService:
+    """
+    Renders the live graph on demand.
+
+    Rendered artifacts are kept until the next change, so repeated requests for an unchanged
+    graph don't render again. The layout positions are kept between renders, so only the
+    clusters changed by events are laid out again.
+    """
+
+    def __init__(
+        self,
+        jira_client: JiraClient,
+        live_graph: LiveBlockerGraph,
+        sprint_codes: str,
+        layout_settings=None,
+    ):
+        self.jira_client = jira_client
+        self.live_graph = live_graph
+        self.sprint_codes = sprint_codes
+        self.layout_settings = layout_settings
+        self.position_cache: dict = {}
+        self.artifacts: dict = {}
+        self.render_lock = threading.Lock()
+        self.version: typing.Optional[int] = None
+
+    def get_artifact(self, output_format: str) -> typing.Optional[bytes]:
+        """Return the current graph in the requested format, or None if it has no chains"""
+        with self.render_lock:
+            if self.version != self.live_graph.version:
+                self.artifacts.clear()
+            if output_format not in self.artifacts:
+                self.artifacts[output_format] = self._render(output_format)
+            return self.artifacts[output_format]
+
+    def _render(self, output_format: str) -> typing.Optional[bytes]:
+        graph, issues, node_sizes, self.version = self.live_graph.snapshot()
+        if graph.number_of_nodes() == 0:
+            return None
+        if output_format == "html":
+            html_data = build_html_data(
+                graph,
+                issues,
+                node_sizes,
+                self.jira_client,
+                self.sprint_codes,
+                node_pos=self.position_cache.get("layout"),
+            )
+            return render_html(html_data).encode()
+
+        return render_graph(
+            graph,
+            issues,
+            node_sizes,
+            self.jira_client,
+            self.sprint_codes,
+            image_format=output_format,
+            layout_settings=self.layout_settings,
+            position_cache=self.position_cache,
+        )
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    """
+    Receives Jira webhooks at POST /webhook and serves the live graph at
+    GET /graph?format=png|svg|html.
+
+    When a secret is set, payloads must carry a matching X-Hub-Signature header
+    ("sha256=" followed by the HMAC-SHA256 of the body), as sent by Jira webhooks with a secret.
+    """
+
+    service: WebhookService
+    secret: typing.Optional[str] = None
+
+    def do_POST(self):
+        if urllib.parse.urlparse(self.path).path != "/webhook":
+            self._send_error(404, f"Unknown path: {self.path}")
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.secret:
+            expected = "sha256=" + hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(expected, self.headers.get("X-Hub-Signature", "")):
+                self._send_error(401, "Invalid webhook signature")
+                return
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError as e:
+            self._send_error(400, f"Invalid JSON payload: {e}")
+            return
+        if not isinstance(payload, dict):
+            self._send_error(400, "Webhook payload must be a JSON object")
+            return
+
+        try:
+            changed = self.service.live_graph.apply_event(payload)
+        except Exception as e:
+            print(f"An error occurred applying a webhook: {e}")
+            self._send_error(500, f"Error applying webhook: {e}")
+            return
+        self._send(200, "application/json", json.dumps({"changed": changed}).encode())
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path == "/health":
+            self._send(200, "text/plain", b"ok")
+            return
+        if url.path != "/graph":
+            self._send_error(404, f"Unknown path: {url.path}")
+            return
+
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        output_format = params.get("format", "png")
+        if output_format not in CONTENT_TYPES:
+            self._send_error(400, f"format must be one of: {', '.join(CONTENT_TYPES)}")
+            return
+        artifact = self.service.get_artifact(output_format)
+        if artifact is None:
+            self._send_error(404, "No blocker chains found in the specified sprints.")
+            return
+        self._send(200, CONTENT_TYPES[output_format], artifact)
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send(status, "application/json", json.dumps({"error": message}).encode())
+
+
+def run_webhook_server(
+    jira_client: JiraClient,
+    project_key: str,
+    sprint_codes: str,
+    team_guid: str,
+    host: str,
+    port: int,
+    secret=None,
+    layout_settings=None,
+):
+    """
+    Seed the live graph from one fetch, then keep it up to date from webhooks until interrupted.
+
+    Args:
+        jira_client: JiraClient instance
+        project_key: The Jira project key
+        sprint_codes: Comma-separated list of sprint codes
+        team_guid: The team's GUID
+        host: Interface to listen on
+        port: Port to listen on
+        secret: Optional webhook secret used to verify payload signatures
+        layout_settings: Optional dictionary with layout settings for the visualizer
+    """
+    # Requests are rendered off the main thread, so use a non-interactive backend
+    plt.switch_backend("Agg")
+
+    live_graph = LiveBlockerGraph(jira_client.fetch_issues(project_key, sprint_codes, team_guid))
+    print(
+        f"Tracking {len(live_graph.issues)} tickets, "
+        f"{live_graph.graph.number_of_edges()} blocker links"
+    )
+    WebhookRequestHandler.service = WebhookService(
+        jira_client, live_graph, sprint_codes, layout_settings
+    )
+    WebhookRequestHandler.secret = secret
+    httpd = ThreadingHTTPServer((host, port), WebhookRequestHandler)
+    print(f"Receiving Jira webhooks on http://{host}:{port}/webhook (Ctrl+C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping webhook receiver")
+    finally:
+        httpd.server_close()
+
+
+def replay_webhooks(path: str, url: str, secret=None) -> int:
+    """
+    Post recorded webhook payloads to a running receiver, in order.
+
+    Args:
+        path: File with one JSON payload per line
+        url: Webhook URL of the receiver, e.g. http://127.0.0.1:8080/webhook
+        secret: Optional webhook secret used to sign the payloads
+
+    Returns:
+        Number of payloads that changed the graph
+    """
+    changed = 0
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            body = line.strip().encode()
+            headers = {"Content-Type": "application/json"}
+            if secret:
+                signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+                headers["X-Hub-Signature"] = f"sha256={signature}"
+            try:
+                response = requests.post(url, data=body, headers=headers)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                raise ValueError(f"Error replaying payload on line {line_number}: {e}")
+            if response.json().get("changed"):
+                changed += 1
+    print(f"Replayed payloads from {path}, {changed} changed the graph")
+    return changed